@@ -1,69 +1,499 @@
 #!/usr/bin/env python3
 import os
+import json
+import socket
+import time
+import shutil
+import argparse
+import asyncio
+import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from lxml import etree
 from tqdm import tqdm
+from tqdm.utils import CallbackIOWrapper
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import quote
 
-def download_file(url, local_path):
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+DEFAULT_CONCURRENCY = 8
+PART_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024  # read/write size for streamed downloads
+SOCKET_RCVBUF = 0  # SO_RCVBUF in bytes for download sockets; 0 keeps OS autotuning
+
+S3_NS = '{http://s3.amazonaws.com/doc/2006-03-01/}'
+LISTING_CACHE_FILE = '.listing.json'
+LISTING_CACHE_TTL = 3600  # seconds before the bucket is listed again
+ETAG_CACHE_FILE = '.etags.json'  # ETags of downloaded files, keyed by file name
+DATA_FILE_SUFFIXES = ('.csv',)  # object keys to download
+
+_thread_local = threading.local()
+_etag_lock = threading.Lock()
+_range_pool = None
+_range_pool_lock = threading.Lock()
+
+class SocketTunedAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections use a fixed TCP receive buffer size."""
+    
+    def __init__(self, rcvbuf, **kwargs):
+        self.rcvbuf = rcvbuf
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+def get_session():
+    """
+    Return the requests session owned by the calling thread.
+    
+    Sessions are not shared between threads; each download worker keeps its own
+    so pooled keep-alive connections (and their TLS handshakes) are reused
+    across files. Transient 5xx responses are retried with backoff. When
+    SOCKET_RCVBUF is set, connections use that TCP receive buffer size.
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        pool_options = dict(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        if SOCKET_RCVBUF > 0:
+            adapter = SocketTunedAdapter(SOCKET_RCVBUF, **pool_options)
+        else:
+            adapter = HTTPAdapter(**pool_options)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _thread_local.session = session
+    return session
+
+def _partial_path(local_path):
+    """
+    Temporary path a download is written to before being renamed into place.
+    
+    The name is dot-prefixed so TiDB Lightning, which imports every
+    '{schema}.{table}.csv*' file in the data directory, never picks it up.
+    """
+    directory, name = os.path.split(local_path)
+    return os.path.join(directory, f".{name}.part")
+
+def _file_progress_bar(local_path, total_size):
+    """Create a byte progress bar for downloading a single file."""
+    return tqdm(
+        desc=f"Downloading {os.path.basename(local_path)}",
+        total=total_size,
+        unit='B',
+        unit_scale=True,
+        unit_divisor=1024,
+    )
+
+def download_file(url, local_path, progress_bar=None):
     """
     Download a file from a public S3 bucket with a progress bar.
     
     :param url: Direct URL to the file in the S3 bucket
     :param local_path: Path to save the file locally
+    :param progress_bar: Shared tqdm bar to update; a per-file bar is used if None
     :return: True if file was downloaded, False if skipped
     """
     # Check if file already exists
     if os.path.exists(local_path):
-        print(f"File {local_path} already exists, skipping download.")
+        tqdm.write(f"File {local_path} already exists, skipping download.")
         return False
     
+    # Write to a temporary name so a failed download never leaves a
+    # truncated file at local_path.
+    partial_path = _partial_path(local_path)
     try:
-        response = requests.get(url, stream=True)
+        response = get_session().get(url, stream=True)
         response.raise_for_status()
         total_size = int(response.headers.get('content-length', 0))
         os.makedirs(os.path.dirname(local_path), exist_ok=True)
         
-        with open(local_path, 'wb') as file, tqdm(
-            desc=f"Downloading {os.path.basename(local_path)}",
-            total=total_size,
-            unit='B',
-            unit_scale=True,
-            unit_divisor=1024,
-        ) as progress_bar:
-            for chunk in response.iter_content(chunk_size=8192):
-                file.write(chunk)
-                progress_bar.update(len(chunk))
-        print(f"Downloaded {url} to {local_path}")
+        # Copy straight from the raw stream, bypassing the iter_content
+        # generator; progress is reported by wrapping the file's write method.
+        response.raw.decode_content = True
+        bar_context = nullcontext(progress_bar) if progress_bar else _file_progress_bar(local_path, total_size)
+        with open(partial_path, 'wb', buffering=CHUNK_SIZE) as file, bar_context as bar:
+            progress_file = CallbackIOWrapper(bar.update, file, 'write')
+            shutil.copyfileobj(response.raw, progress_file, length=CHUNK_SIZE)
+        os.replace(partial_path, local_path)
+        tqdm.write(f"Downloaded {url} to {local_path}")
+        return True
+    except Exception as e:
+        tqdm.write(f"Error downloading file: {e}")
+        return False
+    finally:
+        # Also runs on KeyboardInterrupt; after a successful rename there is
+        # nothing left to remove
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+def _etag_cache_path(local_path):
+    """Path of the ETag cache kept alongside local_path."""
+    return os.path.join(os.path.dirname(local_path), ETAG_CACHE_FILE)
+
+def _read_etags(cache_path):
+    """Load the {file name: ETag} mapping, or an empty one if there is none yet."""
+    try:
+        with open(cache_path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def _write_etag(local_path, etag):
+    """
+    Record the ETag of a downloaded file in the directory's ETag cache.
+    
+    One dot-prefixed JSON file is used rather than a sidecar per file, since
+    TiDB Lightning imports every '{schema}.{table}.csv*' file it finds in the
+    data directory.
+    """
+    if not etag:
+        return
+    cache_path = _etag_cache_path(local_path)
+    with _etag_lock:
+        etags = _read_etags(cache_path)
+        etags[os.path.basename(local_path)] = etag
+        temp_path = cache_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(etags, file)
+        os.replace(temp_path, cache_path)
+        # Drop a sidecar left by older versions of this script
+        if os.path.exists(local_path + '.etag'):
+            os.remove(local_path + '.etag')
+
+def is_up_to_date(local_path, remote_size, remote_etag):
+    """
+    Check whether a local file matches the remote object.
+    
+    The sizes must match and, when an ETag was recorded for the local file at
+    download time, it must also equal the current remote ETag.
+    
+    :param local_path: Path of the local file
+    :param remote_size: Content-Length reported for the remote object
+    :param remote_etag: ETag reported for the remote object (may be None)
+    :return: True if the local file can be kept as is
+    """
+    if os.path.getsize(local_path) != remote_size:
+        return False
+    
+    recorded_etag = _read_etags(_etag_cache_path(local_path)).get(os.path.basename(local_path))
+    if remote_etag and recorded_etag:
+        return recorded_etag == remote_etag
+    return True
+
+def _get_range_pool(concurrency):
+    """
+    Return the pool that fetches byte ranges for every file.
+    
+    One long-lived pool, sized by its first caller, bounds the number of open
+    range connections to `concurrency` however many files are in flight, and
+    its threads keep their sessions (and keep-alive connections) across files.
+    """
+    global _range_pool
+    with _range_pool_lock:
+        if _range_pool is None:
+            _range_pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='range')
+        return _range_pool
+
+def _download_range(url, path, start, end, progress_bar):
+    """
+    Fetch bytes [start, end] of url and write them at the same offset in path.
+    """
+    response = get_session().get(url, headers={'Range': f'bytes={start}-{end}'}, stream=True)
+    response.raise_for_status()
+    if response.status_code != 206:
+        raise RuntimeError(f"Server ignored range request for bytes {start}-{end}")
+    
+    with open(path, 'rb+', buffering=CHUNK_SIZE) as file:
+        file.seek(start)
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            file.write(chunk)
+            progress_bar.update(len(chunk))
+
+def download_file_ranged(url, local_path, part_size=PART_SIZE, concurrency=DEFAULT_CONCURRENCY,
+                         progress_bar=None):
+    """
+    Download a large file as concurrent byte-range requests.
+    
+    The object is split into part_size ranges which are fetched in parallel and
+    written straight to their offsets in a preallocated file. Objects smaller
+    than one part, or servers that do not accept ranges, use download_file.
+    An existing local file is kept when its size and recorded ETag still match
+    the HEAD response, so re-runs transfer no file data.
+    
+    :param url: Direct URL to the file in the S3 bucket
+    :param local_path: Path to save the file locally
+    :param part_size: Size in bytes of each range request
+    :param concurrency: Number of ranges to download at the same time, across all files
+    :param progress_bar: Shared tqdm bar to update; a per-file bar is used if None
+    :return: True if file was downloaded, False if skipped
+    """
+    try:
+        head = get_session().head(url)
+        head.raise_for_status()
+        total_size = int(head.headers.get('content-length', 0))
+        accepts_ranges = head.headers.get('accept-ranges', '').lower() == 'bytes'
+        etag = head.headers.get('etag')
+    except Exception as e:
+        tqdm.write(f"Error fetching file metadata: {e}")
+        return False
+    
+    if os.path.exists(local_path):
+        if is_up_to_date(local_path, total_size, etag):
+            tqdm.write(f"File {local_path} already exists, skipping download.")
+            return False
+        tqdm.write(f"File {local_path} does not match the remote copy, downloading again.")
+        os.remove(local_path)
+    
+    if total_size < part_size or not accepts_ranges:
+        downloaded = download_file(url, local_path, progress_bar)
+        if downloaded:
+            _write_etag(local_path, etag)
+        return downloaded
+    
+    # Write to a temporary name so an interrupted download is never mistaken
+    # for a complete file on the next run.
+    partial_path = _partial_path(local_path)
+    ranges = [
+        (start, min(start + part_size, total_size) - 1)
+        for start in range(0, total_size, part_size)
+    ]
+    
+    try:
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        with open(partial_path, 'wb') as file:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(file.fileno(), 0, total_size)
+            else:
+                file.truncate(total_size)
+        
+        range_pool = _get_range_pool(concurrency)
+        bar_context = nullcontext(progress_bar) if progress_bar else _file_progress_bar(local_path, total_size)
+        with bar_context as bar:
+            futures = [
+                range_pool.submit(_download_range, url, partial_path, start, end, bar)
+                for start, end in ranges
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                # On failure, drop the ranges not yet started and let the
+                # running ones finish before the partial file is removed
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+        
+        os.replace(partial_path, local_path)
+        _write_etag(local_path, etag)
+        tqdm.write(f"Downloaded {url} to {local_path} ({len(ranges)} parts)")
         return True
     except Exception as e:
-        print(f"Error downloading file: {e}")
+        tqdm.write(f"Error downloading file: {e}")
         return False
+    finally:
+        # Also runs on KeyboardInterrupt; after a successful rename there is
+        # nothing left to remove
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+def iter_bucket_objects(bucket_url):
+    """
+    Yield (key, size, etag) for each object in a public S3 bucket listing.
+    
+    The XML response is parsed as a stream, and each <Contents> element is
+    discarded once it has been read, so memory use does not grow with the
+    size of the listing. Listings are requested with ListObjectsV2 and
+    truncated pages are followed via their continuation token, so buckets
+    with more than 1000 objects are listed completely.
+    
+    :param bucket_url: Public URL of the S3 bucket
+    """
+    params = {'list-type': 2}
+    
+    while True:
+        response = get_session().get(bucket_url, params=params, stream=True)
+        response.raise_for_status()
+        response.raw.decode_content = True
+        
+        is_truncated = False
+        continuation_token = None
+        tags = (f'{S3_NS}Contents', f'{S3_NS}IsTruncated', f'{S3_NS}NextContinuationToken')
+        for _, element in etree.iterparse(response.raw, events=('end',), tag=tags):
+            if element.tag == f'{S3_NS}Contents':
+                yield (
+                    element.findtext(f'{S3_NS}Key'),
+                    int(element.findtext(f'{S3_NS}Size') or 0),
+                    element.findtext(f'{S3_NS}ETag'),
+                )
+            elif element.tag == f'{S3_NS}IsTruncated':
+                is_truncated = element.text == 'true'
+            else:
+                continuation_token = element.text
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        
+        if not is_truncated or not continuation_token:
+            break
+        params = {'list-type': 2, 'continuation-token': continuation_token}
+
+def cached_bucket_objects(bucket_url, cache_path, ttl=LISTING_CACHE_TTL):
+    """
+    Yield (key, size, etag) for a bucket, reusing a recent on-disk listing.
+    
+    A listing cached less than ttl seconds ago is read from cache_path without
+    any HTTP request. Otherwise the bucket is listed again and the result is
+    written to cache_path once the listing has completed.
+    
+    :param bucket_url: Public URL of the S3 bucket
+    :param cache_path: Path of the JSON listing cache
+    :param ttl: Maximum age of the cache in seconds
+    """
+    cached_objects = None
+    try:
+        if time.time() - os.path.getmtime(cache_path) < ttl:
+            with open(cache_path) as file:
+                cached = json.load(file)
+            if cached.get('bucket_url') == bucket_url:
+                cached_objects = [(key, size, etag) for key, size, etag in cached['objects']]
+    except (OSError, ValueError, KeyError, TypeError):
+        cached_objects = None
+    
+    if cached_objects is not None:
+        yield from cached_objects
+        return
+    
+    objects = []
+    for obj in iter_bucket_objects(bucket_url):
+        objects.append(obj)
+        yield obj
+    
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    with open(cache_path, 'w') as file:
+        json.dump({'bucket_url': bucket_url, 'objects': objects}, file)
+
+async def _download_file_async(session, semaphore, url, local_path, progress_bar):
+    """
+    Download one file on the asyncio event loop.
+    
+    :return: True if file was downloaded, False on error
+    """
+    async with semaphore:
+        partial_path = _partial_path(local_path)
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                with open(partial_path, 'wb', buffering=CHUNK_SIZE) as file:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        await asyncio.to_thread(file.write, chunk)
+                        progress_bar.update(len(chunk))
+                etag = response.headers.get('ETag')
+            os.replace(partial_path, local_path)
+            _write_etag(local_path, etag)
+            tqdm.write(f"Downloaded {url} to {local_path}")
+            return True
+        except Exception as e:
+            tqdm.write(f"Error downloading file: {e}")
+            return False
+        finally:
+            # Also runs when the task is cancelled
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+async def download_files_async(tasks, concurrency, progress_bar):
+    """
+    Download many (url, local_path) pairs concurrently with aiohttp.
+    
+    A single event loop multiplexes up to `concurrency` requests, which scales
+    further than one thread per connection when there are many small objects.
+    
+    :return: List of booleans, True for each file that was downloaded
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    connector = aiohttp.TCPConnector(limit=max(1, concurrency))
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*[
+            _download_file_async(session, semaphore, url, local_path, progress_bar)
+            for url, local_path in tasks
+        ])
 
-def list_and_download_csv_files(bucket_url, local_dir):
+def list_and_download_csv_files(bucket_url, local_dir, concurrency=DEFAULT_CONCURRENCY, use_async=False):
     """
-    List all CSV files in a public S3 bucket and download them.
+    List all CSV files in a public S3 bucket and download them in parallel.
+    
+    Downloads are queued as soon as their key is listed, so the first files
+    start transferring while later listing pages are still being fetched.
+    All transfers report into one aggregate progress bar whose total grows
+    as files are queued. With use_async (and aiohttp installed), files are
+    instead downloaded whole on an asyncio event loop once listing finishes.
     
     :param bucket_url: Public URL of the S3 bucket
     :param local_dir: Local directory to save the CSV files
+    :param concurrency: Number of files to download at the same time
+    :param use_async: Download with aiohttp instead of the thread pool
     :return: Tuple of (downloaded_count, skipped_count, total_csv_files)
     """
     downloaded_count = 0
     skipped_count = 0
     total_csv_files = 0
     
+    if use_async and aiohttp is None:
+        print("aiohttp is not installed, using threaded downloads instead.")
+        use_async = False
+    
     try:
-        response = requests.get(bucket_url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'xml')
-        contents = soup.find_all('Contents')
-        
-        for content in contents:
-            key = content.find('Key').text
-            if key.endswith('.csv'):
+        with tqdm(
+            desc="Downloading",
+            total=0,
+            unit='B',
+            unit_scale=True,
+            unit_divisor=1024,
+            position=0,
+        ) as progress_bar, ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = []
+            async_tasks = []
+            base_url = bucket_url.rstrip('/') + '/'
+            cache_path = os.path.join(local_dir, LISTING_CACHE_FILE)
+            csv_objects = (
+                obj for obj in cached_bucket_objects(bucket_url, cache_path)
+                if obj[0].endswith(DATA_FILE_SUFFIXES)
+            )
+            for key, size, etag in csv_objects:
                 total_csv_files += 1
-                file_url = bucket_url.rstrip('/') + '/' + key
+                file_url = base_url + quote(key)
                 local_path = os.path.join(local_dir, key)
-                if download_file(file_url, local_path):
+                # The listing already carries size and ETag, so files that
+                # are known to be current need no HEAD request at all
+                if os.path.exists(local_path) and is_up_to_date(local_path, size, etag):
+                    tqdm.write(f"File {local_path} already exists, skipping download.")
+                    skipped_count += 1
+                    continue
+                progress_bar.total += size
+                progress_bar.refresh()
+                if use_async:
+                    async_tasks.append((file_url, local_path))
+                else:
+                    futures.append(executor.submit(download_file_ranged, file_url, local_path,
+                                                   concurrency=concurrency, progress_bar=progress_bar))
+            
+            results = [future.result() for future in futures]
+            if async_tasks:
+                results += asyncio.run(download_files_async(async_tasks, concurrency, progress_bar))
+            
+            for downloaded in results:
+                if downloaded:
                     downloaded_count += 1
                 else:
                     skipped_count += 1
@@ -73,6 +503,18 @@ def list_and_download_csv_files(bucket_url, local_dir):
     return downloaded_count, skipped_count, total_csv_files
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Download the BTS flight data CSV files')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Number of parallel downloads (default: {DEFAULT_CONCURRENCY}, use 1 on slow links)')
+    parser.add_argument('--socket-rcvbuf', type=int, default=SOCKET_RCVBUF,
+                        help='TCP receive buffer in bytes for download sockets, e.g. 8388608 for '
+                             'high-latency links (default: 0, let the OS autotune)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Download with asyncio/aiohttp (optional dependency) instead of threads; '
+                             'suited to buckets with many small files')
+    args = parser.parse_args()
+    SOCKET_RCVBUF = args.socket_rcvbuf
+    
     bucket_url = "https://bts-flights-data.s3.us-west-2.amazonaws.com/"
     local_dir = "csv/"
     
@@ -84,7 +526,8 @@ if __name__ == "__main__":
         print(f"Directory {local_dir} already exists")
     
     print("Downloading CSV files from flight data bucket...")
-    downloaded_count, skipped_count, total_csv_files = list_and_download_csv_files(bucket_url, local_dir)
+    downloaded_count, skipped_count, total_csv_files = list_and_download_csv_files(
+        bucket_url, local_dir, args.concurrency, args.use_async)
     
     if total_csv_files == 0:
         print("No CSV files found in the bucket.")
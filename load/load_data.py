@@ -1,19 +1,42 @@
 #!/usr/bin/env python3
 
 import os
+import base64
+import re
+import math
 import sys
+import socket
 import time
 import logging
 import subprocess
 import argparse
 import requests
 import difflib
+import mmap
+import zlib
+import random
+import queue
+import threading
+import http.client
 from abc import ABC, abstractmethod
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests.structures import CaseInsensitiveDict
+from urllib.parse import urlsplit
+
+try:
+    import mysql.connector
+    from mysql.connector import Error as MySQLError
+    from mysql.connector.pooling import MySQLConnectionPool
+except ImportError:
+    # Only the TiDB, Doris, StarRocks and ColumnStore loaders need it
+    mysql = None
 
 DEFAULT_PORTS = {
     'clickhouse': 9000,
@@ -24,22 +47,87 @@ DEFAULT_PORTS = {
 }
 
 REQUIRED_CSV_FILES = ["bts.airlines.csv", "bts.airports.csv", "bts.flights.csv"]
+DATA_BUCKET_URL = "https://bts-flights-data.s3.us-west-2.amazonaws.com/"
+
+# Resolved once, and absolute, so paths stay valid for subprocesses run
+# with a different working directory
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+CSV_DIR = PROJECT_ROOT / "csv"
 
 CONNECTION_TIMEOUT = 60
 STARROCKS_TIMEOUT = 120  # StarRocks needs more time to start up
 DORIS_TIMEOUT = 120  # Doris needs more time for backend nodes to initialize
 MAX_RETRIES = 3
 RETRY_DELAY = 2
+MAX_RETRY_DELAY = 30
+POLL_DELAY = 0.5  # first readiness probe interval, doubled up to MAX_POLL_DELAY
+MAX_POLL_DELAY = 5
+IO_POOL_WORKERS = 8  # threads in _IO_POOL, i.e. per-file tasks running at once
+# Connections kept open per MySQL-protocol loader. get_connection() fails
+# rather than waits when every connection is checked out, so there is one
+# for each per-file task that can run at once
+MYSQL_POOL_SIZE = IO_POOL_WORKERS
+# Pooled connections are handed back as they are: the loaders leave no
+# session state behind beyond the DDL's USE (later queries qualify table
+# names anyway), and not every MySQL-compatible server implements
+# COM_RESET_CONNECTION
+MYSQL_POOL_RESET_SESSION = False
+
+CLICKHOUSE_HTTP_PORT = 8123  # default for --clickhouse-http-port
+CLICKHOUSE_INSERT_PARTS = os.cpu_count() or 4  # concurrent INSERTs for one large CSV file
+CLICKHOUSE_SPLIT_THRESHOLD = 128 * 1024 * 1024  # only split files larger than this
+
+# Insert tuning shared by the HTTP interface and the native driver
+CLICKHOUSE_INSERT_SETTINGS = {
+    'max_memory_usage': 20000000000,
+    'max_threads': 16,
+    'max_insert_threads': 8,
+    'max_insert_block_size': 1000000,
+    'min_insert_block_size_rows': 100000,
+    'min_insert_block_size_bytes': 268435456,
+    'async_insert': 1,
+    'wait_for_async_insert': 0,
+    'async_insert_max_data_size': 1000000000,
+    'async_insert_busy_timeout_ms': 1000,
+}
+
+# TiDB Lightning output lines worth logging at INFO; the rest go to DEBUG
+LIGHTNING_LOG_PATTERN = re.compile(rb'progress|error|warn|complete|imported', re.IGNORECASE)
+LIGHTNING_OUTPUT_BUFFER = 1024 * 1024
+LIGHTNING_TAIL_LINES = 50  # output lines shown when the import fails
+
+STREAM_LOAD_PARTS = 4  # concurrent Stream Loads for one large CSV file
+STREAM_LOAD_SPLIT_THRESHOLD = 256 * 1024 * 1024  # only split files larger than this
+STREAM_LOAD_MAX_RANGE_BYTES = 1024 * 1024 * 1024  # upper bound on one Stream Load request body
+STREAM_LOAD_CHUNK_BYTES = 4 * 1024 * 1024  # socket write size for Stream Load request bodies
+
+# Where docker/columnstore.yml bind-mounts the host csv/ directory (read-only)
+COLUMNSTORE_CSV_DIR = "/var/lib/columnstore/csv"
+# Extra cpimport options for the flights file: more read buffers (-b) and
+# parser threads (-w) than the defaults of 5 and 3
+COLUMNSTORE_FLIGHTS_CPIMPORT_OPTIONS = ["-b", "8", "-w", str(min(16, os.cpu_count() or 4))]
+
+# Shared by every loader for per-file work (one task per CSV file) so
+# repeated load_data calls reuse threads; nested per-range work keeps its
+# own short-lived pools, since waiting on tasks queued in the same pool
+# could exhaust it
+_IO_POOL = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix='loader-io')
+
+DATABASE_CHOICES = ('clickhouse', 'tidb', 'doris', 'starrocks', 'columnstore')
 
 class DatabaseChoiceAction(argparse.Action):
     """Custom action that provides suggestions for invalid database choices"""
     
     def __call__(self, parser, namespace, values, option_string=None):
-        valid_choices = ['clickhouse', 'tidb', 'doris', 'starrocks', 'columnstore']
+        valid_choices = DATABASE_CHOICES
         
         if values not in valid_choices:
-            # Find closest matches
-            close_matches = difflib.get_close_matches(values, valid_choices, n=3, cutoff=0.6)
+            # Prefer a prefix match (e.g. 'click'); fall back to
+            # difflib's fuzzy matching only for real typos
+            close_matches = [choice for choice in valid_choices if choice.startswith(values)]
+            if not close_matches:
+                close_matches = difflib.get_close_matches(values, valid_choices, n=3, cutoff=0.6)
             error_msg = f"invalid choice: '{values}' (choose from {', '.join(valid_choices)})"
             
             if close_matches:
@@ -56,6 +144,11 @@ class DatabaseConfig:
     user: str = 'root'
     password: str = ''
     database: str = 'bts'
+    stream_load_workers: int = 3
+    stream_load_compress: bool = False
+    stream_load_sendfile: bool = True
+    tidb_import: str = 'lightning'
+    clickhouse_http_port: int = CLICKHOUSE_HTTP_PORT
 
 def setup_logging(level: int = logging.INFO) -> logging.Logger:
     logging.basicConfig(
@@ -66,9 +159,7 @@ def setup_logging(level: int = logging.INFO) -> logging.Logger:
     return logging.getLogger(__name__)
 
 def verify_csv_files() -> Path:
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    csv_dir = project_root / "csv"
+    csv_dir = CSV_DIR
     
     if not csv_dir.exists():
         raise FileNotFoundError(
@@ -76,9 +167,11 @@ def verify_csv_files() -> Path:
             "Please run 'python3 load/get_data.py' first to download the data."
         )
     
+    # One directory read instead of a stat() per file
+    present = {entry.name for entry in os.scandir(csv_dir)}
     missing_files = [
         file for file in REQUIRED_CSV_FILES 
-        if not (csv_dir / file).exists()
+        if file not in present
     ]
     
     if missing_files:
@@ -87,6 +180,62 @@ def verify_csv_files() -> Path:
     logging.getLogger(__name__).info("All required CSV files found.")
     return csv_dir
 
+def download_csv_files_in_background(csv_dir: Path) -> "queue.Queue[Optional[str]]":
+    """Download the required CSV files on a background thread.
+    
+    The returned queue yields each file name as soon as it is complete on
+    disk, followed by None once every download has been attempted. A file
+    whose download fails is only queued if an up-to-date copy is already
+    on disk.
+    """
+    # get_data pulls in lxml/tqdm, which only this code path needs
+    from get_data import download_file_ranged, get_session, is_up_to_date
+    
+    logger = logging.getLogger(__name__)
+    ready: "queue.Queue[Optional[str]]" = queue.Queue()
+    
+    def matches_remote(url: str, csv_file_path: Path) -> bool:
+        # download_file_ranged returns False both when it skipped a current
+        # file and when it failed, so check the local copy against the bucket
+        if not csv_file_path.exists():
+            return False
+        try:
+            head = get_session().head(url)
+            head.raise_for_status()
+        except Exception as e:
+            logger.error(f"Error checking {csv_file_path.name}: {e}")
+            return False
+        return is_up_to_date(str(csv_file_path), int(head.headers.get('content-length', 0)),
+                             head.headers.get('etag'))
+    
+    def download() -> None:
+        try:
+            # REQUIRED_CSV_FILES is ordered smallest first, so the small
+            # tables can load while flights is still downloading
+            for csv_file in REQUIRED_CSV_FILES:
+                csv_file_path = csv_dir / csv_file
+                url = DATA_BUCKET_URL + csv_file
+                try:
+                    downloaded = download_file_ranged(url, str(csv_file_path))
+                except Exception as e:
+                    logger.error(f"Error downloading {csv_file}: {e}")
+                    downloaded = False
+                if downloaded or matches_remote(url, csv_file_path):
+                    ready.put(csv_file)
+                else:
+                    logger.error(f"❌ {csv_file} is not available, it will not be loaded")
+        finally:
+            ready.put(None)
+    
+    csv_dir.mkdir(parents=True, exist_ok=True)
+    threading.Thread(target=download, name="csv-download", daemon=True).start()
+    return ready
+
+def drain_queue(ready: "queue.Queue[Optional[str]]") -> None:
+    """Block until a download queue from download_csv_files_in_background is done."""
+    while ready.get() is not None:
+        pass
+
 def run_docker_command(command: str, description: str) -> bool:
     logger = logging.getLogger(__name__)
     try:
@@ -110,6 +259,208 @@ def run_docker_command(command: str, description: str) -> bool:
             logger.error(f"Error: {e.stderr}")
         return False
 
+def submit_io(fn, *args, limit: Optional[threading.Semaphore] = None):
+    """Run fn(*args) on _IO_POOL, holding `limit` (if given) while it runs"""
+    if limit is None:
+        return _IO_POOL.submit(fn, *args)
+    
+    def run():
+        with limit:
+            return fn(*args)
+    
+    return _IO_POOL.submit(run)
+
+def backoff_delay(attempt: int, base: float = RETRY_DELAY, cap: float = MAX_RETRY_DELAY,
+                  jitter: float = 0.5) -> float:
+    """Exponential backoff with jitter for the given 0-based retry attempt"""
+    return min(cap, base * 2 ** attempt) * (1 + random.uniform(-jitter, jitter))
+
+def poll_delay(attempt: int) -> float:
+    """Delay between readiness probes: starts short so a fast server is
+    noticed quickly, then backs off so a slow one is not hammered"""
+    return backoff_delay(attempt, base=POLL_DELAY, cap=MAX_POLL_DELAY, jitter=0.3)
+
+def port_open(host: str, port: int, timeout: float = 2) -> bool:
+    """Cheap TCP probe, used before paying for a full MySQL handshake"""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+def require_mysql_connector() -> None:
+    """Fail with an install hint if a MySQL-protocol loader runs without the connector"""
+    if mysql is None:
+        raise ImportError("mysql-connector-python is required for this database "
+                          "(pip install -r requirements.txt)")
+
+def execute_script(cursor, sql_commands: List[str]) -> None:
+    """Send SQL statements to the server as a single multi-statement round trip"""
+    cursor.execute(";\n".join(sql_commands))
+    # Each statement produces its own result; errors surface while draining them
+    while cursor.nextset():
+        pass
+
+def split_csv_offsets(csv_file_path: Path, parts: int) -> List[Tuple[int, int]]:
+    """Split a CSV file into up to `parts` (start, end) byte ranges on line boundaries"""
+    file_size = csv_file_path.stat().st_size
+    if parts <= 1 or file_size == 0:
+        return [(0, file_size)]
+    
+    offsets = [0]
+    with open(csv_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, parts):
+            target = max(file_size * i // parts, offsets[-1])
+            newline = mm.find(b'\n', target)
+            if newline == -1 or newline + 1 >= file_size:
+                break
+            if newline + 1 > offsets[-1]:
+                offsets.append(newline + 1)
+    offsets.append(file_size)
+    
+    return list(zip(offsets[:-1], offsets[1:]))
+
+def prefetch_file(path: Path) -> None:
+    """Ask the kernel to start reading a file into the page cache.
+    
+    Returns immediately; readahead continues in the background, so a reader
+    started afterwards (even inside a container sharing the host's page
+    cache) finds most of the file already in memory.
+    """
+    if not hasattr(mmap, 'MADV_WILLNEED') or path.stat().st_size == 0:
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+        mm.madvise(mmap.MADV_WILLNEED)
+
+class FileRange:
+    """
+    Bytes [start, end) of a file, used as an HTTP request body.
+    
+    Iterating yields STREAM_LOAD_CHUNK_BYTES blocks so the body goes to the
+    socket in a few large writes rather than the HTTP client's default 8-16 KB
+    reads. The length is known up front, so requests still sends a
+    Content-Length header instead of chunked encoding, and every iteration
+    starts again from `start`, so a retried request resends the whole range.
+    """
+    
+    def __init__(self, path: Path, start: int, end: int, chunk_size: int = STREAM_LOAD_CHUNK_BYTES):
+        self._file = open(path, 'rb', buffering=0)
+        self._start = start
+        self._length = end - start
+        self._chunk_size = chunk_size
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __iter__(self):
+        self._file.seek(self._start)
+        remaining = self._length
+        while remaining > 0:
+            data = self._file.read(min(self._chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    
+    def close(self) -> None:
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class GzipBody:
+    """Gzip-compresses an iterable request body as it is sent"""
+    
+    def __init__(self, source, level: int = 1):
+        self._source = source
+        self._level = level
+    
+    def __iter__(self):
+        # wbits=31 produces a gzip container rather than a raw zlib stream
+        compressor = zlib.compressobj(self._level, zlib.DEFLATED, 31)
+        for chunk in self._source:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+def sendfile_put(connection: http.client.HTTPConnection, url: str, headers: Dict[str, str],
+                 auth: Tuple[str, str], path: Path, start: int, end: int) -> requests.Response:
+    """
+    PUT bytes [start, end) of a file on a plain-HTTP connection using sendfile(2).
+    
+    The kernel copies the page cache straight to the socket, so the body is
+    never read into Python. The connection is kept alive for the caller's
+    next request. If the server answers before the body is fully sent (bad
+    credentials, a redirect, a rejected label), that response is returned
+    instead of the broken-pipe error. Other failures close the connection,
+    so the next call reconnects, and are raised as requests.ConnectionError
+    so callers can treat this like Session.put.
+    """
+    parts = urlsplit(url)
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    credentials = base64.b64encode(f"{auth[0]}:{auth[1]}".encode()).decode()
+    
+    try:
+        connection.putrequest('PUT', target, skip_accept_encoding=True)
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.putheader('Authorization', f"Basic {credentials}")
+        connection.putheader('Content-Length', str(end - start))
+        connection.endheaders()
+        
+        cut_short = False
+        try:
+            with open(path, 'rb') as f:
+                # Falls back to plain send() where os.sendfile is unavailable
+                connection.sock.sendfile(f, start, end - start)
+        except OSError as send_error:
+            # The server may have replied and closed its end early
+            try:
+                raw = connection.getresponse()
+            except (OSError, http.client.HTTPException):
+                raise send_error
+            cut_short = True
+        else:
+            raw = connection.getresponse()
+        
+        response = requests.Response()
+        response.status_code = raw.status
+        response.reason = raw.reason
+        response.headers = CaseInsensitiveDict(raw.getheaders())
+        response._content = raw.read()
+        response.encoding = 'utf-8'
+        response.url = url
+        if cut_short:
+            # The rest of the body was never sent, so the connection is unusable
+            connection.close()
+        return response
+    except (OSError, http.client.HTTPException) as e:
+        connection.close()
+        raise requests.ConnectionError(e) from e
+
+def log_stream_load_results(logger: logging.Logger, results: List[Dict[str, Any]], total_time: float) -> None:
+    """Log rows and throughput for one file from its Stream Load responses"""
+    # A retried request whose first attempt had already committed reports
+    # 'Label Already Exists' with no row counts, so it is reported apart
+    # rather than silently adding 0 to the total
+    finished_earlier = [result for result in results if result.get('Status') == 'Label Already Exists']
+    loaded = [result for result in results if result.get('Status') != 'Label Already Exists']
+    row_count = sum(int(result.get('NumberLoadedRows', 0)) for result in loaded)
+    load_bytes = sum(int(result.get('LoadBytes', 0)) for result in loaded)
+    avg_rate = row_count / total_time if total_time > 0 else 0
+    mb_rate = load_bytes / (1024 * 1024) / total_time if total_time > 0 else 0
+    logger.info(f"✅ Successfully loaded {row_count:,} rows in {total_time:.1f}s "
+                f"(avg {avg_rate:,.0f} rows/sec, {mb_rate:,.1f} MB/sec)")
+    if finished_earlier:
+        labels = ', '.join(result.get('Label', '?') for result in finished_earlier)
+        logger.info(f"ℹ {len(finished_earlier)} of {len(results)} Stream Loads had already committed "
+                    f"on an earlier attempt ({labels}); their rows are not included above")
+
 class DatabaseLoader(ABC):
     
     def __init__(self, config: DatabaseConfig):
@@ -126,109 +477,152 @@ class DatabaseLoader(ABC):
     
     def test_connection(self) -> bool:
         return True
+    
+    def close(self) -> None:
+        """Release connections held by the loader"""
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+# Schema DDL is built once at import time; {database} is filled in per run
+CLICKHOUSE_DDL = (
+    "DROP DATABASE IF EXISTS {database}",
+    "CREATE DATABASE {database}",
+    """CREATE TABLE {database}.airlines (
+        `iata_code` Nullable(String),
+        `airline` Nullable(String)
+    ) ENGINE = MergeTree()
+    ORDER BY tuple()""",
+    """CREATE TABLE {database}.airports (
+        `iata_code` Nullable(String),
+        `airport` Nullable(String),
+        `city` Nullable(String),
+        `state` Nullable(String),
+        `country` Nullable(String),
+        `latitude` Nullable(Decimal(11,4)),
+        `longitude` Nullable(Decimal(11,4))
+    ) ENGINE = MergeTree()
+    ORDER BY tuple()""",
+    """CREATE TABLE {database}.flights (
+        `year` Nullable(Int16),
+        `month` Nullable(Int8),
+        `day` Nullable(Int8),
+        `day_of_week` Nullable(Int8),
+        `fl_date` Nullable(Date),
+        `carrier` Nullable(String),
+        `tail_num` Nullable(String),
+        `fl_num` Nullable(Int16),
+        `origin` Nullable(String),
+        `dest` Nullable(String),
+        `crs_dep_time` Nullable(String),
+        `dep_time` Nullable(String),
+        `dep_delay` Nullable(Decimal(13,2)),
+        `taxi_out` Nullable(Decimal(13,2)),
+        `wheels_off` Nullable(String),
+        `wheels_on` Nullable(String),
+        `taxi_in` Nullable(Decimal(13,2)),
+        `crs_arr_time` Nullable(String),
+        `arr_time` Nullable(String),
+        `arr_delay` Nullable(Decimal(13,2)),
+        `cancelled` Nullable(Decimal(13,2)),
+        `cancellation_code` Nullable(String),
+        `diverted` Nullable(Decimal(13,2)),
+        `crs_elapsed_time` Nullable(Decimal(13,2)),
+        `actual_elapsed_time` Nullable(Decimal(13,2)),
+        `air_time` Nullable(Decimal(13,2)),
+        `distance` Nullable(Decimal(13,2)),
+        `carrier_delay` Nullable(Decimal(13,2)),
+        `weather_delay` Nullable(Decimal(13,2)),
+        `nas_delay` Nullable(Decimal(13,2)),
+        `security_delay` Nullable(Decimal(13,2)),
+        `late_aircraft_delay` Nullable(Decimal(13,2))
+    ) ENGINE = MergeTree()
+    ORDER BY tuple()"""
+)
 
 class ClickHouseLoader(DatabaseLoader):
+    """
+    Loads the CSV files over ClickHouse's HTTP interface.
+    
+    Files are sent unmodified: empty fields are mapped to defaults/NULL by the
+    server (input_format_csv_empty_as_default, input_format_null_as_default),
+    so no client-side rewrite pass over the data is needed.
+    """
     
     def __init__(self, config: DatabaseConfig):
         super().__init__(config)
+        # One native connection is reused for all DDL and COUNT queries; it
+        # is created on first use and guarded because the driver's Client
+        # is not thread-safe
+        self._client = None
+        self._client_unavailable = False
+        self._client_lock = threading.Lock()
         
-    @contextmanager
     def _get_client(self):
-        try:
-            from clickhouse_driver import Client
-            client = Client(host=self.config.host, port=self.config.port)
-            yield client
-        except ImportError:
-            self.logger.warning("clickhouse_driver not available, using CLI")
-            yield None
-        except Exception as e:
-            self.logger.error(f"Error connecting to ClickHouse: {e}")
-            yield None
-        finally:
-            if 'client' in locals():
+        """Return the shared clickhouse_driver client, or None to use the CLI"""
+        with self._client_lock:
+            if self._client is None and not self._client_unavailable:
                 try:
-                    client.disconnect()
-                except:
-                    pass
+                    from clickhouse_driver import Client
+                    self._client = Client(host=self.config.host, port=self.config.port,
+                                          settings=CLICKHOUSE_INSERT_SETTINGS)
+                except ImportError:
+                    self.logger.warning("clickhouse_driver not available, using CLI")
+                    self._client_unavailable = True
+            return self._client
+    
+    def close(self) -> None:
+        if self._client is not None:
+            try:
+                self._client.disconnect()
+            except Exception:
+                pass
+            self._client = None
     
     def _execute_sql_command(self, sql_command: str) -> bool:
+        client = self._get_client()
+        if client is not None:
+            try:
+                with self._client_lock:
+                    client.execute(sql_command)
+                return True
+            except Exception as e:
+                self.logger.error(f"Error executing SQL: {e}")
+                return False
+        
         try:
-            cmd = [
-                'clickhouse', 'client',
-                '--host', self.config.host,
-                '--port', str(self.config.port),
-                '--query', sql_command
-            ]
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            self._run_cli_query(sql_command)
             return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            with self._get_client() as client:
-                if client:
-                    try:
-                        client.execute(sql_command)
-                        return True
-                    except Exception as e:
-                        self.logger.error(f"Error executing SQL: {e}")
-                        return False
-                return False
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            self.logger.error(f"Error executing SQL: {e}")
+            return False
+    
+    def _run_cli_query(self, sql_command: str) -> str:
+        cmd = [
+            'clickhouse', 'client',
+            '--host', self.config.host,
+            '--port', str(self.config.port),
+            '--query', sql_command
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return result.stdout
+    
+    def _count_rows(self, table_name: str) -> int:
+        sql_command = f"SELECT COUNT(*) FROM {self.config.database}.{table_name}"
+        client = self._get_client()
+        if client is not None:
+            with self._client_lock:
+                return client.execute(sql_command)[0][0]
+        return int(self._run_cli_query(sql_command).strip())
     
     def create_database_and_tables(self) -> None:
         self.logger.info("Creating ClickHouse database and tables...")
         
-        sql_commands = [
-            f"DROP DATABASE IF EXISTS {self.config.database}",
-            f"CREATE DATABASE {self.config.database}",
-            f"""CREATE TABLE {self.config.database}.airlines (
-                `iata_code` Nullable(String),
-                `airline` Nullable(String)
-            ) ENGINE = MergeTree()
-            ORDER BY tuple()""",
-            f"""CREATE TABLE {self.config.database}.airports (
-                `iata_code` Nullable(String),
-                `airport` Nullable(String),
-                `city` Nullable(String),
-                `state` Nullable(String),
-                `country` Nullable(String),
-                `latitude` Nullable(Decimal(11,4)),
-                `longitude` Nullable(Decimal(11,4))
-            ) ENGINE = MergeTree()
-            ORDER BY tuple()""",
-            f"""CREATE TABLE {self.config.database}.flights (
-                `year` Nullable(Int16),
-                `month` Nullable(Int8),
-                `day` Nullable(Int8),
-                `day_of_week` Nullable(Int8),
-                `fl_date` Nullable(Date),
-                `carrier` Nullable(String),
-                `tail_num` Nullable(String),
-                `fl_num` Nullable(Int16),
-                `origin` Nullable(String),
-                `dest` Nullable(String),
-                `crs_dep_time` Nullable(String),
-                `dep_time` Nullable(String),
-                `dep_delay` Nullable(Decimal(13,2)),
-                `taxi_out` Nullable(Decimal(13,2)),
-                `wheels_off` Nullable(String),
-                `wheels_on` Nullable(String),
-                `taxi_in` Nullable(Decimal(13,2)),
-                `crs_arr_time` Nullable(String),
-                `arr_time` Nullable(String),
-                `arr_delay` Nullable(Decimal(13,2)),
-                `cancelled` Nullable(Decimal(13,2)),
-                `cancellation_code` Nullable(String),
-                `diverted` Nullable(Decimal(13,2)),
-                `crs_elapsed_time` Nullable(Decimal(13,2)),
-                `actual_elapsed_time` Nullable(Decimal(13,2)),
-                `air_time` Nullable(Decimal(13,2)),
-                `distance` Nullable(Decimal(13,2)),
-                `carrier_delay` Nullable(Decimal(13,2)),
-                `weather_delay` Nullable(Decimal(13,2)),
-                `nas_delay` Nullable(Decimal(13,2)),
-                `security_delay` Nullable(Decimal(13,2)),
-                `late_aircraft_delay` Nullable(Decimal(13,2))
-            ) ENGINE = MergeTree()
-            ORDER BY tuple()"""
-        ]
+        sql_commands = [sql.format(database=self.config.database) for sql in CLICKHOUSE_DDL]
         
         for sql_command in sql_commands:
             if not self._execute_sql_command(sql_command):
@@ -245,143 +639,188 @@ class ClickHouseLoader(DatabaseLoader):
             f"{self.config.database}.flights.csv": "flights"
         }
         
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = []
-            for csv_file, table_name in file_table_mapping.items():
-                csv_file_path = csv_dir / csv_file
-                if csv_file_path.exists():
-                    future = executor.submit(self._load_file, csv_file_path, table_name)
-                    futures.append(future)
-                else:
-                    self.logger.warning(f"{csv_file} not found, skipping...")
-            
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    self.logger.error(f"Error in concurrent loading: {e}")
-                    raise
+        present = {entry.name for entry in os.scandir(csv_dir)}
+        
+        load_times = {}
+        futures = {}
+        for csv_file, table_name in file_table_mapping.items():
+            csv_file_path = csv_dir / csv_file
+            if csv_file in present:
+                future = submit_io(self._load_file, csv_file_path, table_name)
+                futures[future] = table_name
+            else:
+                self.logger.warning(f"{csv_file} not found, skipping...")
+        
+        for future in as_completed(futures):
+            try:
+                load_times[futures[future]] = future.result()
+            except Exception as e:
+                self.logger.error(f"Error in concurrent loading: {e}")
+                raise
+        
+        # Row counts are taken once every INSERT has finished, so a COUNT(*)
+        # never holds up a loader thread while other files are still loading
+        for table_name, total_time in load_times.items():
+            try:
+                row_count = self._count_rows(table_name)
+            except Exception as e:
+                self.logger.warning(f"Could not get row count for {table_name}: {e}")
+                continue
+            avg_rate = row_count / total_time if total_time > 0 else 0
+            self.logger.info(f"✅ Successfully loaded {row_count:,} rows into {table_name} in {total_time:.1f}s "
+                           f"(avg {avg_rate:,.0f} rows/sec)")
         
         self.logger.info("✅ All data loaded successfully into ClickHouse!")
     
-    def _load_file(self, csv_file_path: Path, table_name: str) -> None:
+    def _load_file(self, csv_file_path: Path, table_name: str) -> float:
+        """INSERT one CSV file and return the elapsed time in seconds"""
         self.logger.info(f"Loading {csv_file_path.name} into table {table_name}...")
         
         start_time = time.time()
         
-        cmd = [
-            'clickhouse', 'client',
-            '--host', self.config.host,
-            '--port', str(self.config.port),
-            '--max_memory_usage', '20000000000',
-            '--max_threads', '16',
-            '--max_insert_threads', '8',
-            '--max_insert_block_size', '1000000',
-            '--min_insert_block_size_rows', '100000',
-            '--min_insert_block_size_bytes', '268435456',
-            '--async_insert', '1',
-            '--wait_for_async_insert', '0',
-            '--async_insert_max_data_size', '1000000000',
-            '--async_insert_busy_timeout_ms', '1000',
-            '--query', f"INSERT INTO {self.config.database}.{table_name} FORMAT CSV",
-            '--input_format_csv_empty_as_default', '1',
-            '--input_format_csv_skip_first_lines', '0'
-        ]
+        # The file is streamed as-is over the HTTP interface and parsed once,
+        # by the server, instead of being piped through a clickhouse client
+        # process that re-encodes it into native blocks
+        url = f"http://{self.config.host}:{self.config.clickhouse_http_port}/"
+        params = {
+            'query': f"INSERT INTO {self.config.database}.{table_name} FORMAT CSV",
+            'input_format_csv_empty_as_default': 1,
+            'input_format_null_as_default': 1,
+            'input_format_csv_skip_first_lines': 0,
+            **CLICKHOUSE_INSERT_SETTINGS
+        }
         
         try:
-            with open(csv_file_path, 'rb') as f:
-                subprocess.run(cmd, stdin=f, capture_output=True, check=True)
-            
-            total_time = time.time() - start_time
+            # Large files are split on row boundaries and inserted by
+            # concurrent requests, so client-side reading and server-side
+            # parsing both scale with the available cores
+            file_size = csv_file_path.stat().st_size
+            if file_size > CLICKHOUSE_SPLIT_THRESHOLD:
+                ranges = split_csv_offsets(csv_file_path, CLICKHOUSE_INSERT_PARTS)
+            else:
+                ranges = [(0, file_size)]
             
-            count_cmd = [
-                'clickhouse', 'client', 
-                '--host', self.config.host, 
-                '--port', str(self.config.port),
-                '--query', f"SELECT COUNT(*) FROM {self.config.database}.{table_name}"
-            ]
-            result = subprocess.run(count_cmd, capture_output=True, text=True, check=True)
-            row_count = int(result.stdout.strip())
-            avg_rate = row_count / total_time if total_time > 0 else 0
+            if len(ranges) == 1:
+                self._insert_range(url, params, table_name, csv_file_path, *ranges[0])
+            else:
+                self.logger.info(f"Splitting {csv_file_path.name} into {len(ranges)} parallel INSERTs")
+                with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                    futures = [
+                        executor.submit(self._insert_range, url, params, table_name,
+                                        csv_file_path, range_start, range_end)
+                        for range_start, range_end in ranges
+                    ]
+                    for future in as_completed(futures):
+                        future.result()
             
-            self.logger.info(f"✅ Successfully loaded {row_count:,} rows in {total_time:.1f}s "
-                           f"(avg {avg_rate:,.0f} rows/sec)")
-        except subprocess.CalledProcessError as e:
+            return time.time() - start_time
+        except (requests.RequestException, RuntimeError) as e:
             self.logger.error(f"Error loading {csv_file_path}: {e}")
             raise
+    
+    def _insert_range(self, url: str, params: Dict[str, Any], table_name: str,
+                      csv_file_path: Path, start: int, end: int) -> None:
+        """POST bytes [start, end) of a CSV file as one INSERT"""
+        with FileRange(csv_file_path, start, end) as body:
+            response = requests.post(url, params=params, data=body, timeout=3600)
+        if response.status_code != 200:
+            self.logger.error(f"HTTP error {response.status_code}: {response.text}")
+            raise RuntimeError(f"INSERT failed for {table_name}")
 
-    def _preprocess_csv_for_quotes(self, csv_file_path: Path) -> Path:
-        """Preprocess CSV to handle optionally quoted fields properly"""
-        import csv
-        import tempfile
-        
-        self.logger.info(f"Preprocessing {csv_file_path.name} to handle quoted fields...")
-        
-        # Create a temporary file for the processed CSV
-        temp_dir = csv_file_path.parent / "temp"
-        temp_dir.mkdir(exist_ok=True)
-        temp_file = temp_dir / f"processed_{csv_file_path.name}"
-        
-        try:
-            with open(csv_file_path, 'r', encoding='utf-8') as infile, \
-                 open(temp_file, 'w', encoding='utf-8', newline='') as outfile:
-                
-                csv_reader = csv.reader(infile, quoting=csv.QUOTE_MINIMAL)
-                csv_writer = csv.writer(outfile, quoting=csv.QUOTE_NONE, escapechar='\\')
-                
-                for row in csv_reader:
-                    # Process each field to handle quotes and empty values
-                    processed_row = []
-                    for field in row:
-                        # Convert empty string to NULL for StarRocks
-                        if field == '':
-                            processed_row.append('\\N')
-                        else:
-                            processed_row.append(field)
-                    csv_writer.writerow(processed_row)
-            
-            self.logger.info(f"✅ Preprocessing completed: {temp_file}")
-            return temp_file
-            
-        except Exception as e:
-            self.logger.error(f"Error preprocessing CSV: {e}")
-            raise
-
-    def _cleanup_temp_files(self, csv_file_path: Path) -> None:
-        """Clean up temporary processed files"""
-        temp_dir = csv_file_path.parent / "temp"
-        if temp_dir.exists():
-            import shutil
-            shutil.rmtree(temp_dir)
-            self.logger.info("Cleaned up temporary files")
+# TiDB schema, run as one multi-statement script
+TIDB_DDL = (
+    "DROP DATABASE IF EXISTS `{database}`",
+    "CREATE DATABASE `{database}`",
+    "USE `{database}`",
+    """CREATE TABLE `airlines` (
+        `iata_code` varchar(2) DEFAULT NULL,
+        `airline` varchar(30) DEFAULT NULL
+    )""",
+    """CREATE TABLE `airports` (
+        `iata_code` varchar(3) DEFAULT NULL,
+        `airport` varchar(80) DEFAULT NULL,
+        `city` varchar(30) DEFAULT NULL,
+        `state` varchar(2) DEFAULT NULL,
+        `country` varchar(30) DEFAULT NULL,
+        `latitude` decimal(11,4) DEFAULT NULL,
+        `longitude` decimal(11,4) DEFAULT NULL
+    )""",
+    """CREATE TABLE `flights` (
+        `year` smallint(6) DEFAULT NULL,
+        `month` tinyint(4) DEFAULT NULL,
+        `day` tinyint(4) DEFAULT NULL,
+        `day_of_week` tinyint(4) DEFAULT NULL,
+        `fl_date` date DEFAULT NULL,
+        `carrier` varchar(2) DEFAULT NULL,
+        `tail_num` varchar(6) DEFAULT NULL,
+        `fl_num` smallint(6) DEFAULT NULL,
+        `origin` varchar(5) DEFAULT NULL,
+        `dest` varchar(5) DEFAULT NULL,
+        `crs_dep_time` varchar(4) DEFAULT NULL,
+        `dep_time` varchar(4) DEFAULT NULL,
+        `dep_delay` decimal(13,2) DEFAULT NULL,
+        `taxi_out` decimal(13,2) DEFAULT NULL,
+        `wheels_off` varchar(4) DEFAULT NULL,
+        `wheels_on` varchar(4) DEFAULT NULL,
+        `taxi_in` decimal(13,2) DEFAULT NULL,
+        `crs_arr_time` varchar(4) DEFAULT NULL,
+        `arr_time` varchar(4) DEFAULT NULL,
+        `arr_delay` decimal(13,2) DEFAULT NULL,
+        `cancelled` decimal(13,2) DEFAULT NULL,
+        `cancellation_code` varchar(20) DEFAULT NULL,
+        `diverted` decimal(13,2) DEFAULT NULL,
+        `crs_elapsed_time` decimal(13,2) DEFAULT NULL,
+        `actual_elapsed_time` decimal(13,2) DEFAULT NULL,
+        `air_time` decimal(13,2) DEFAULT NULL,
+        `distance` decimal(13,2) DEFAULT NULL,
+        `carrier_delay` decimal(13,2) DEFAULT NULL,
+        `weather_delay` decimal(13,2) DEFAULT NULL,
+        `nas_delay` decimal(13,2) DEFAULT NULL,
+        `security_delay` decimal(13,2) DEFAULT NULL,
+        `late_aircraft_delay` decimal(13,2) DEFAULT NULL
+    )"""
+)
 
 class TiDBLoader(DatabaseLoader):
     
     def __init__(self, config: DatabaseConfig):
         super().__init__(config)
+        self._pool = None
     
     @contextmanager
     def _get_connection(self):
-        import mysql.connector
-        from mysql.connector import Error
+        require_mysql_connector()
         
         connection = None
         try:
-            connection = mysql.connector.connect(
-                host=self.config.host,
-                port=self.config.port,
-                user=self.config.user,
-                password=self.config.password,
-                autocommit=True,
-                connect_timeout=CONNECTION_TIMEOUT
-            )
+            # Created on the first successful connect; later calls borrow an
+            # already authenticated connection instead of reconnecting
+            if self._pool is None:
+                self._pool = MySQLConnectionPool(
+                    pool_name="tidb_loader",
+                    pool_size=MYSQL_POOL_SIZE,
+                    pool_reset_session=MYSQL_POOL_RESET_SESSION,
+                    host=self.config.host,
+                    port=self.config.port,
+                    user=self.config.user,
+                    password=self.config.password,
+                    autocommit=True,
+                    connect_timeout=CONNECTION_TIMEOUT,
+                    client_flags=[mysql.connector.ClientFlag.MULTI_STATEMENTS],
+                    allow_local_infile=self.config.tidb_import == 'local-infile'
+                )
+            connection = self._pool.get_connection()
             yield connection
-        except Error as e:
+        except MySQLError as e:
             self.logger.error(f"Database connection error: {e}")
             raise
         finally:
-            if connection and connection.is_connected():
-                connection.close()
+            if connection:
+                try:
+                    # Returns the connection to the pool
+                    connection.close()
+                except MySQLError:
+                    pass
     
     def test_connection(self) -> bool:
         try:
@@ -394,12 +833,14 @@ class TiDBLoader(DatabaseLoader):
     def wait_for_connection(self, timeout: int = CONNECTION_TIMEOUT) -> bool:
         self.logger.info("Waiting for TiDB to be ready...")
         start_time = time.time()
+        attempt = 0
         
         while time.time() - start_time < timeout:
             if self.test_connection():
                 self.logger.info("TiDB is ready!")
                 return True
-            time.sleep(RETRY_DELAY)
+            time.sleep(poll_delay(attempt))
+            attempt += 1
         
         self.logger.error(f"Timeout waiting for TiDB connection after {timeout} seconds")
         return False
@@ -407,64 +848,12 @@ class TiDBLoader(DatabaseLoader):
     def create_database_and_tables(self) -> None:
         self.logger.info("Creating TiDB database and tables...")
         
-        sql_commands = [
-            f"DROP DATABASE IF EXISTS `{self.config.database}`",
-            f"CREATE DATABASE `{self.config.database}`",
-            f"USE `{self.config.database}`",
-            """CREATE TABLE `airlines` (
-                `iata_code` varchar(2) DEFAULT NULL,
-                `airline` varchar(30) DEFAULT NULL
-            )""",
-            """CREATE TABLE `airports` (
-                `iata_code` varchar(3) DEFAULT NULL,
-                `airport` varchar(80) DEFAULT NULL,
-                `city` varchar(30) DEFAULT NULL,
-                `state` varchar(2) DEFAULT NULL,
-                `country` varchar(30) DEFAULT NULL,
-                `latitude` decimal(11,4) DEFAULT NULL,
-                `longitude` decimal(11,4) DEFAULT NULL
-            )""",
-            """CREATE TABLE `flights` (
-                `year` smallint(6) DEFAULT NULL,
-                `month` tinyint(4) DEFAULT NULL,
-                `day` tinyint(4) DEFAULT NULL,
-                `day_of_week` tinyint(4) DEFAULT NULL,
-                `fl_date` date DEFAULT NULL,
-                `carrier` varchar(2) DEFAULT NULL,
-                `tail_num` varchar(6) DEFAULT NULL,
-                `fl_num` smallint(6) DEFAULT NULL,
-                `origin` varchar(5) DEFAULT NULL,
-                `dest` varchar(5) DEFAULT NULL,
-                `crs_dep_time` varchar(4) DEFAULT NULL,
-                `dep_time` varchar(4) DEFAULT NULL,
-                `dep_delay` decimal(13,2) DEFAULT NULL,
-                `taxi_out` decimal(13,2) DEFAULT NULL,
-                `wheels_off` varchar(4) DEFAULT NULL,
-                `wheels_on` varchar(4) DEFAULT NULL,
-                `taxi_in` decimal(13,2) DEFAULT NULL,
-                `crs_arr_time` varchar(4) DEFAULT NULL,
-                `arr_time` varchar(4) DEFAULT NULL,
-                `arr_delay` decimal(13,2) DEFAULT NULL,
-                `cancelled` decimal(13,2) DEFAULT NULL,
-                `cancellation_code` varchar(20) DEFAULT NULL,
-                `diverted` decimal(13,2) DEFAULT NULL,
-                `crs_elapsed_time` decimal(13,2) DEFAULT NULL,
-                `actual_elapsed_time` decimal(13,2) DEFAULT NULL,
-                `air_time` decimal(13,2) DEFAULT NULL,
-                `distance` decimal(13,2) DEFAULT NULL,
-                `carrier_delay` decimal(13,2) DEFAULT NULL,
-                `weather_delay` decimal(13,2) DEFAULT NULL,
-                `nas_delay` decimal(13,2) DEFAULT NULL,
-                `security_delay` decimal(13,2) DEFAULT NULL,
-                `late_aircraft_delay` decimal(13,2) DEFAULT NULL
-            )"""
-        ]
+        sql_commands = [sql.format(database=self.config.database) for sql in TIDB_DDL]
         
         with self._get_connection() as connection:
             cursor = connection.cursor()
             try:
-                for sql_command in sql_commands:
-                    cursor.execute(sql_command)
+                execute_script(cursor, sql_commands)
                 self.logger.info("✅ Database and tables created successfully")
             except Exception as e:
                 self.logger.error(f"❌ Error creating database and tables: {e}")
@@ -473,9 +862,61 @@ class TiDBLoader(DatabaseLoader):
                 cursor.close()
     
     def load_data(self, csv_dir: Path) -> None:
+        if self.config.tidb_import == 'local-infile':
+            self._load_with_local_infile(csv_dir)
+        else:
+            self._load_with_lightning(csv_dir)
+    
+    def _load_with_local_infile(self, csv_dir: Path) -> None:
+        """Load each CSV with LOAD DATA LOCAL INFILE, for hosts without TiUP.
+        
+        Slower than Lightning's physical import, but each table is a single
+        statement streamed by the client, and the tables load side by side.
+        """
+        self.logger.info("Starting data loading with LOAD DATA LOCAL INFILE...")
+        
+        tables = ["airlines", "airports", "flights"]
+        futures = [
+            submit_io(self._load_table_local_infile, csv_dir / f"bts.{table}.csv", table)
+            for table in tables
+        ]
+        for future in as_completed(futures):
+            future.result()
+        
+        self.logger.info("✅ All data loaded successfully into TiDB!")
+    
+    def _load_table_local_infile(self, csv_file_path: Path, table_name: str) -> None:
+        self.logger.info(f"Loading {csv_file_path.name} into table {table_name}...")
+        
+        if not csv_file_path.exists():
+            raise FileNotFoundError(f"Required CSV file not found: {csv_file_path}")
+        
+        # Same CSV dialect as tidb-lightning.toml: quoted fields, backslash
+        # escapes (so \N is NULL) and no header row
+        file_name = str(csv_file_path.resolve()).replace("\\", "\\\\").replace("'", "\\'")
+        sql = (f"LOAD DATA LOCAL INFILE '{file_name}' "
+               f"INTO TABLE `{self.config.database}`.`{table_name}` "
+               "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' "
+               "LINES TERMINATED BY '\\n'")
+        
+        start_time = time.time()
+        with self._get_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql)
+                row_count = cursor.rowcount
+            finally:
+                cursor.close()
+        
+        total_time = time.time() - start_time
+        avg_rate = row_count / total_time if total_time > 0 else 0
+        self.logger.info(f"✅ Successfully loaded {row_count:,} rows in {total_time:.1f}s "
+                         f"(avg {avg_rate:,.0f} rows/sec)")
+    
+    def _load_with_lightning(self, csv_dir: Path) -> None:
         self.logger.info("Starting data loading with TiDB Lightning...")
         
-        config_path = Path(__file__).parent / "tidb-lightning.toml"
+        config_path = SCRIPT_DIR / "tidb-lightning.toml"
         
         if not config_path.exists():
             self.logger.error(f"{config_path} configuration file not found")
@@ -483,50 +924,62 @@ class TiDBLoader(DatabaseLoader):
         
         self.logger.info("Starting TiDB Lightning data import...")
         
-        project_root = Path(__file__).parent.parent
-        original_cwd = Path.cwd()
+        # Lightning resolves the relative paths in its config against the
+        # working directory; passing cwd keeps this process's own cwd alone
+        start_time = time.time()
+        process = subprocess.Popen(
+            ["tiup", "tidb-lightning", "-config", str(config_path)],
+            cwd=PROJECT_ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=LIGHTNING_OUTPUT_BUFFER
+        )
         
+        # Read raw bytes through a large buffer and only decode and log
+        # the lines that matter; the tail is kept for error reporting
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        info = self.logger.isEnabledFor(logging.INFO)
+        tail = deque(maxlen=LIGHTNING_TAIL_LINES)
         try:
-            os.chdir(project_root)
-            
-            start_time = time.time()
-            process = subprocess.Popen(
-                ["tiup", "tidb-lightning", "-config", str(config_path)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1
-            )
-            
             for line in process.stdout:
-                self.logger.info(line.rstrip())
+                tail.append(line)
+                if info and LIGHTNING_LOG_PATTERN.search(line):
+                    self.logger.info(line.rstrip().decode(errors='replace'))
+                elif debug:
+                    self.logger.debug(line.rstrip().decode(errors='replace'))
             
             return_code = process.wait()
-            
-            if return_code == 0:
-                total_time = time.time() - start_time
-                self.logger.info(f"✅ TiDB Lightning completed successfully in {total_time:.1f}s")
-                
-                # Get row counts for each table
-                try:
-                    with self._get_connection() as connection:
-                        cursor = connection.cursor()
-                        tables = ["airlines", "airports", "flights"]
-                        for table in tables:
-                            cursor.execute(f"SELECT COUNT(*) FROM {self.config.database}.{table}")
-                            row_count = cursor.fetchone()[0]
-                            self.logger.info(f"✅ Successfully loaded {row_count:,} rows into {table}")
-                        cursor.close()
-                except Exception as e:
-                    self.logger.warning(f"Could not get row counts: {e}")
-                
-                self.logger.info("✅ All data loaded successfully into TiDB!")
-            else:
-                self.logger.error(f"TiDB Lightning failed with return code: {return_code}")
-                raise RuntimeError(f"TiDB Lightning failed with code {return_code}")
-                
+        except BaseException:
+            # e.g. Ctrl-C while reading: don't leave Lightning running on its own
+            process.kill()
+            process.wait()
+            raise
         finally:
-            os.chdir(original_cwd)
+            process.stdout.close()
+        
+        if return_code == 0:
+            total_time = time.time() - start_time
+            self.logger.info(f"✅ TiDB Lightning completed successfully in {total_time:.1f}s")
+            
+            # Get row counts for each table
+            try:
+                with self._get_connection() as connection:
+                    cursor = connection.cursor()
+                    tables = ["airlines", "airports", "flights"]
+                    for table in tables:
+                        cursor.execute(f"SELECT COUNT(*) FROM {self.config.database}.{table}")
+                        row_count = cursor.fetchone()[0]
+                        self.logger.info(f"✅ Successfully loaded {row_count:,} rows into {table}")
+                    cursor.close()
+            except Exception as e:
+                self.logger.warning(f"Could not get row counts: {e}")
+            
+            self.logger.info("✅ All data loaded successfully into TiDB!")
+        else:
+            self.logger.error(f"TiDB Lightning failed with return code: {return_code}")
+            for line in tail:
+                self.logger.error(line.rstrip().decode(errors='replace'))
+            raise RuntimeError(f"TiDB Lightning failed with code {return_code}")
     
     def set_tiflash_replica(self) -> None:
         tables = ['airlines', 'airports', 'flights']
@@ -545,34 +998,144 @@ class TiDBLoader(DatabaseLoader):
             self.logger.error(f"Error setting TiFlash replica: {e}")
             raise
 
+# Doris schema, run as one multi-statement script
+DORIS_DDL = (
+    "DROP DATABASE IF EXISTS `{database}`",
+    "CREATE DATABASE `{database}`",
+    "USE `{database}`",
+    """CREATE TABLE `airlines` (
+      `iata_code` varchar(2),
+      `airline` varchar(30)
+    ) DUPLICATE KEY(`iata_code`)
+    DISTRIBUTED BY HASH(`iata_code`) BUCKETS AUTO
+    PROPERTIES (
+      "replication_num" = "1"
+    )""",
+    """CREATE TABLE `airports` (
+      `iata_code` varchar(3),
+      `airport` varchar(80),
+      `city` varchar(30),
+      `state` varchar(2),
+      `country` varchar(30),
+      `latitude` decimal(11,4),
+      `longitude` decimal(11,4)
+    ) DUPLICATE KEY(`iata_code`)
+    DISTRIBUTED BY HASH(`iata_code`) BUCKETS AUTO
+    PROPERTIES (
+      "replication_num" = "1"
+    )""",
+    """CREATE TABLE `flights` (
+      `year` smallint(6),
+      `month` tinyint(4),
+      `day` tinyint(4),
+      `day_of_week` tinyint(4),
+      `fl_date` date,
+      `carrier` varchar(2),
+      `tail_num` varchar(6),
+      `fl_num` smallint(6),
+      `origin` varchar(5),
+      `dest` varchar(5),
+      `crs_dep_time` varchar(4),
+      `dep_time` varchar(4),
+      `dep_delay` decimal(13,2),
+      `taxi_out` decimal(13,2),
+      `wheels_off` varchar(4),
+      `wheels_on` varchar(4),
+      `taxi_in` decimal(13,2),
+      `crs_arr_time` varchar(4),
+      `arr_time` varchar(4),
+      `arr_delay` decimal(13,2),
+      `cancelled` decimal(13,2),
+      `cancellation_code` varchar(20),
+      `diverted` decimal(13,2),
+      `crs_elapsed_time` decimal(13,2),
+      `actual_elapsed_time` decimal(13,2),
+      `air_time` decimal(13,2),
+      `distance` decimal(13,2),
+      `carrier_delay` decimal(13,2),
+      `weather_delay` decimal(13,2),
+      `nas_delay` decimal(13,2),
+      `security_delay` decimal(13,2),
+      `late_aircraft_delay` decimal(13,2)
+    ) DUPLICATE KEY(`year`, `month`, `day`, `day_of_week`)
+    DISTRIBUTED BY HASH(`fl_date`) BUCKETS AUTO
+    PROPERTIES (
+      "replication_num" = "1"
+    )"""
+)
+
 class DorisLoader(DatabaseLoader):
     
     def __init__(self, config: DatabaseConfig):
         super().__init__(config)
         self.base_url = f"http://{config.user}:{config.password}@{config.host}:8040/api/{config.database}"
+        
+        # Keep-alive connections to the BE HTTP port, sized for every table
+        # and split range being loaded at once
+        pool_size = max(1, config.stream_load_workers) * STREAM_LOAD_PARTS
+        self._session = requests.Session()
+        self._session.auth = (config.user, config.password)
+        self._session.mount('http://', HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+
+        # sendfile(2) bypasses the session, so each worker thread keeps its
+        # own keep-alive connection to the BE and reuses it across ranges
+        self._sendfile_local = threading.local()
+        self._sendfile_connections = []
+        self._sendfile_lock = threading.Lock()
+
+        self._pool = None
+    
+    def close(self) -> None:
+        self._session.close()
+        with self._sendfile_lock:
+            for connection in self._sendfile_connections:
+                connection.close()
+            self._sendfile_connections.clear()
+    
+    def _sendfile_connection(self, url: str) -> http.client.HTTPConnection:
+        """Return the calling thread's connection for sendfile_put, opening it on first use"""
+        connection = getattr(self._sendfile_local, 'connection', None)
+        if connection is None:
+            parts = urlsplit(url)
+            connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=600)
+            self._sendfile_local.connection = connection
+            with self._sendfile_lock:
+                self._sendfile_connections.append(connection)
+        return connection
     
     @contextmanager
     def _get_connection(self):
-        import mysql.connector
-        from mysql.connector import Error
+        require_mysql_connector()
         
         connection = None
         try:
-            connection = mysql.connector.connect(
-                host=self.config.host,
-                user=self.config.user,
-                password=self.config.password,
-                port=self.config.port,
-                connection_timeout=CONNECTION_TIMEOUT,
-                autocommit=True
-            )
+            # Created on the first successful connect, so wait_for_connection
+            # keeps polling over one connection instead of reconnecting
+            if self._pool is None:
+                self._pool = MySQLConnectionPool(
+                    pool_name="doris_loader",
+                    pool_size=MYSQL_POOL_SIZE,
+                    pool_reset_session=MYSQL_POOL_RESET_SESSION,
+                    host=self.config.host,
+                    user=self.config.user,
+                    password=self.config.password,
+                    port=self.config.port,
+                    connection_timeout=CONNECTION_TIMEOUT,
+                    autocommit=True,
+                    client_flags=[mysql.connector.ClientFlag.MULTI_STATEMENTS]
+                )
+            connection = self._pool.get_connection()
             yield connection
-        except Error as e:
+        except MySQLError as e:
             self.logger.error(f"Database connection error: {e}")
             raise
         finally:
-            if connection and connection.is_connected():
-                connection.close()
+            if connection:
+                try:
+                    # Returns the connection to the pool
+                    connection.close()
+                except MySQLError:
+                    pass
 
     def test_connection(self) -> bool:
         try:
@@ -622,6 +1185,7 @@ class DorisLoader(DatabaseLoader):
         self.logger.info("Waiting for DORIS to be ready (frontend + backend nodes)...")
         start_time = time.time()
         last_log_time = start_time
+        attempt = 0
         
         while time.time() - start_time < timeout:
             try:
@@ -637,7 +1201,8 @@ class DorisLoader(DatabaseLoader):
                 self.logger.info(f"Still waiting for backend nodes... ({elapsed}s)")
                 last_log_time = current_time
             
-            time.sleep(5)
+            time.sleep(poll_delay(attempt))
+            attempt += 1
         
         self.logger.error(f"❌ Timeout after {timeout}s. Please check if DORIS is properly started.")
         return False
@@ -646,80 +1211,15 @@ class DorisLoader(DatabaseLoader):
         self.logger.info("Creating Doris database and tables...")
         
         # Doris-specific SQL
-        sql_commands = [
-            f"DROP DATABASE IF EXISTS `{self.config.database}`",
-            f"CREATE DATABASE `{self.config.database}`",
-            f"USE `{self.config.database}`",
-            """CREATE TABLE `airlines` (
-              `iata_code` varchar(2),
-              `airline` varchar(30)
-            ) DUPLICATE KEY(`iata_code`)
-            DISTRIBUTED BY HASH(`iata_code`) BUCKETS AUTO
-            PROPERTIES (
-              "replication_num" = "1"
-            )""",
-            """CREATE TABLE `airports` (
-              `iata_code` varchar(3),
-              `airport` varchar(80),
-              `city` varchar(30),
-              `state` varchar(2),
-              `country` varchar(30),
-              `latitude` decimal(11,4),
-              `longitude` decimal(11,4)
-            ) DUPLICATE KEY(`iata_code`)
-            DISTRIBUTED BY HASH(`iata_code`) BUCKETS AUTO
-            PROPERTIES (
-              "replication_num" = "1"
-            )""",
-            """CREATE TABLE `flights` (
-              `year` smallint(6),
-              `month` tinyint(4),
-              `day` tinyint(4),
-              `day_of_week` tinyint(4),
-              `fl_date` date,
-              `carrier` varchar(2),
-              `tail_num` varchar(6),
-              `fl_num` smallint(6),
-              `origin` varchar(5),
-              `dest` varchar(5),
-              `crs_dep_time` varchar(4),
-              `dep_time` varchar(4),
-              `dep_delay` decimal(13,2),
-              `taxi_out` decimal(13,2),
-              `wheels_off` varchar(4),
-              `wheels_on` varchar(4),
-              `taxi_in` decimal(13,2),
-              `crs_arr_time` varchar(4),
-              `arr_time` varchar(4),
-              `arr_delay` decimal(13,2),
-              `cancelled` decimal(13,2),
-              `cancellation_code` varchar(20),
-              `diverted` decimal(13,2),
-              `crs_elapsed_time` decimal(13,2),
-              `actual_elapsed_time` decimal(13,2),
-              `air_time` decimal(13,2),
-              `distance` decimal(13,2),
-              `carrier_delay` decimal(13,2),
-              `weather_delay` decimal(13,2),
-              `nas_delay` decimal(13,2),
-              `security_delay` decimal(13,2),
-              `late_aircraft_delay` decimal(13,2)
-            ) DUPLICATE KEY(`year`, `month`, `day`, `day_of_week`)
-            DISTRIBUTED BY HASH(`fl_date`) BUCKETS AUTO
-            PROPERTIES (
-              "replication_num" = "1"
-            )"""
-        ]
+        sql_commands = [sql.format(database=self.config.database) for sql in DORIS_DDL]
         
         try:
             with self._get_connection() as connection:
                 cursor = connection.cursor()
                 try:
-                    for i, command in enumerate(sql_commands, 1):
-                        if command.strip():
-                            self.logger.info(f"Executing command {i}/{len(sql_commands)}")
-                            cursor.execute(command)
-                            time.sleep(0.5)
+                    # One round trip for the whole schema; the FE applies DDL
+                    # synchronously, so no settle delay is needed in between
+                    execute_script(cursor, sql_commands)
                     self.logger.info("✅ Database and tables created successfully")
                 except Exception as e:
                     self.logger.error(f"❌ Error creating database and tables: {e}")
@@ -730,7 +1230,13 @@ class DorisLoader(DatabaseLoader):
             self.logger.error(f"Error executing SQL commands: {e}")
             raise
 
-    def load_data(self, csv_dir: Path) -> None:
+    def load_data(self, csv_dir: Path, ready: Optional["queue.Queue[Optional[str]]"] = None) -> None:
+        """Load the CSV files with Stream Load.
+        
+        If `ready` is given (see download_csv_files_in_background), each file
+        is loaded as soon as its name arrives on the queue instead of
+        requiring all downloads to have finished first.
+        """
         self.logger.info("Starting data loading with Doris Stream Load...")
         
         file_table_mapping = {
@@ -739,15 +1245,55 @@ class DorisLoader(DatabaseLoader):
             "bts.flights.csv": "flights"
         }
         
-        for csv_file, table_name in file_table_mapping.items():
+        if ready is None:
+            present = {entry.name for entry in os.scandir(csv_dir)}
+            csv_files = (csv_file for csv_file in file_table_mapping if csv_file in present)
+        else:
+            # The downloader only queues files that are on disk
+            csv_files = iter(ready.get, None)
+        
+        # Each table is an independent PUT, so the loads can overlap; the
+        # worker count caps how many stream loads Doris receives at once.
+        workers = threading.BoundedSemaphore(max(1, self.config.stream_load_workers))
+        futures = []
+        pending = set(file_table_mapping)
+        loaded_tables = []
+        for csv_file in csv_files:
             csv_file_path = csv_dir / csv_file
-            if csv_file_path.exists():
-                self._load_file_via_stream_load(csv_file_path, table_name)
-            else:
-                self.logger.warning(f"{csv_file} not found, skipping...")
+            table_name = file_table_mapping[csv_file]
+            future = submit_io(self._load_file_via_stream_load, csv_file_path, table_name, limit=workers)
+            futures.append(future)
+            pending.discard(csv_file)
+            loaded_tables.append(table_name)
+        
+        for csv_file in sorted(pending):
+            self.logger.warning(f"{csv_file} not found, skipping...")
+        
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"Error in concurrent loading: {e}")
+                raise
         
+        self._verify_row_counts(loaded_tables)
         self.logger.info("✅ All data loaded successfully into Doris!")
 
+    def _verify_row_counts(self, tables: List[str]) -> None:
+        """Log the row count of each loaded table over a single connection"""
+        try:
+            with self._get_connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    for table_name in tables:
+                        cursor.execute(f"SELECT COUNT(*) FROM {self.config.database}.{table_name}")
+                        row_count = cursor.fetchone()[0]
+                        self.logger.info(f"📊 {table_name}: {row_count:,} rows")
+                finally:
+                    cursor.close()
+        except Exception as e:
+            self.logger.warning(f"Could not verify row counts: {e}")
+
     def _load_file_via_stream_load(self, csv_file_path: Path, table_name: str) -> None:
         """Load a single CSV file using Doris Stream Load"""
         self.logger.info(f"Loading {csv_file_path.name} into table {table_name}...")
@@ -755,7 +1301,9 @@ class DorisLoader(DatabaseLoader):
         start_time = time.time()
         url = f"http://{self.config.host}:8040/api/{self.config.database}/{table_name}/_stream_load"
         
-        # Doris-optimized headers
+        # Doris-optimized headers. No Expect: 100-continue, since the BE is
+        # addressed directly (no FE redirect to wait for) and the client
+        # sends the body without waiting for the interim response anyway
         headers = {
             'label': f'doris_load_{table_name}_{int(start_time)}',
             'format': 'csv',
@@ -763,7 +1311,6 @@ class DorisLoader(DatabaseLoader):
             'timeout': '600',
             'max_filter_ratio': '0.1',
             'strict_mode': 'false',
-            'Expect': '100-continue',
             'Content-Type': 'text/plain'
         }
         
@@ -778,104 +1325,270 @@ class DorisLoader(DatabaseLoader):
             })
         
         try:
-            with open(csv_file_path, 'rb') as f:
-                response = requests.put(
-                    url,
-                    headers=headers,
-                    data=f,
-                    auth=(self.config.user, self.config.password),
-                    timeout=600
-                )
+            # Large files are split on row boundaries and sent as concurrent
+            # Stream Loads, each with its own label. Ranges are also capped in
+            # size, so a failed request only resends that range, while at
+            # most STREAM_LOAD_PARTS of them run at once
+            file_size = csv_file_path.stat().st_size
+            if file_size > STREAM_LOAD_SPLIT_THRESHOLD:
+                parts = max(STREAM_LOAD_PARTS, math.ceil(file_size / STREAM_LOAD_MAX_RANGE_BYTES))
+                ranges = split_csv_offsets(csv_file_path, parts)
+            else:
+                ranges = [(0, file_size)]
             
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('Status') == 'Success':
-                    total_time = time.time() - start_time
-                    
-                    try:
-                        with self._get_connection() as connection:
-                            cursor = connection.cursor()
-                            cursor.execute(f"SELECT COUNT(*) FROM {self.config.database}.{table_name}")
-                            row_count = cursor.fetchone()[0]
-                            cursor.close()
-                            
-                        avg_rate = row_count / total_time if total_time > 0 else 0
-                        self.logger.info(f"✅ Successfully loaded {row_count:,} rows in {total_time:.1f}s "
-                                       f"(avg {avg_rate:,.0f} rows/sec)")
-                    except Exception as e:
-                        self.logger.info(f"✅ File loaded successfully in {total_time:.1f}s")
-                        self.logger.warning(f"Could not get row count: {e}")
-                else:
-                    self.logger.error(f"Stream Load failed: {result}")
-                    raise RuntimeError(f"Stream Load failed for {table_name}")
+            if len(ranges) == 1:
+                results = [self._stream_load_range(url, table_name, headers, csv_file_path, *ranges[0])]
             else:
-                self.logger.error(f"HTTP error {response.status_code}: {response.text}")
-                raise RuntimeError(f"HTTP error during Stream Load for {table_name}")
+                self.logger.info(f"Splitting {csv_file_path.name} into {len(ranges)} Stream Loads")
+                with ThreadPoolExecutor(max_workers=min(len(ranges), STREAM_LOAD_PARTS)) as executor:
+                    futures = [
+                        executor.submit(
+                            self._stream_load_range, url, table_name,
+                            {**headers, 'label': f"{headers['label']}_{i}"},
+                            csv_file_path, range_start, range_end
+                        )
+                        for i, (range_start, range_end) in enumerate(ranges)
+                    ]
+                    results = [future.result() for future in as_completed(futures)]
+            
+            # Stream Load reports the rows it wrote, so no extra connection
+            # is needed here; counts are checked once in _verify_row_counts
+            log_stream_load_results(self.logger, results, time.time() - start_time)
                 
         except Exception as e:
             self.logger.error(f"Error loading {csv_file_path}: {e}")
             raise
+    
+    def _stream_load_range(self, url: str, table_name: str, headers: Dict[str, str],
+                           csv_file_path: Path, start: int, end: int) -> Dict[str, Any]:
+        """Send bytes [start, end) of a CSV file as one Stream Load request.
+        
+        Connection errors, 429 and 5xx responses are retried with backoff;
+        other errors (e.g. a rejected request) fail immediately. Retries reuse
+        the same label, so Doris never applies one range twice.
+        
+        Uncompressed ranges are sent with sendfile(2) over the worker
+        thread's keep-alive connection; compressed ones (and HTTPS) go
+        through the session.
+        """
+        use_sendfile = (self.config.stream_load_sendfile and not self.config.stream_load_compress
+                        and url.startswith('http://'))
+        
+        with FileRange(csv_file_path, start, end) as file_range:
+            body = file_range
+            if self.config.stream_load_compress:
+                # Compressed on the fly; the length is unknown, so requests
+                # falls back to chunked transfer encoding
+                body = GzipBody(file_range)
+                headers = {**headers, 'compress_type': 'gz'}
+            
+            for attempt in range(MAX_RETRIES):
+                last_attempt = attempt == MAX_RETRIES - 1
+                try:
+                    if use_sendfile:
+                        response = sendfile_put(self._sendfile_connection(url), url, headers,
+                                                self._session.auth, csv_file_path, start, end)
+                    else:
+                        response = self._session.put(
+                            url,
+                            headers=headers,
+                            data=body,
+                            timeout=600
+                        )
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if last_attempt:
+                        raise
+                    reason = str(e)
+                else:
+                    retryable = response.status_code == 429 or response.status_code >= 500
+                    if not retryable or last_attempt:
+                        break
+                    reason = f"HTTP {response.status_code}"
+                
+                delay = backoff_delay(attempt)
+                self.logger.warning(f"Stream Load for {table_name} failed ({reason}), "
+                                    f"retrying in {delay:.1f}s...")
+                time.sleep(delay)
+        
+        if response.status_code != 200:
+            self.logger.error(f"HTTP error {response.status_code}: {response.text}")
+            raise RuntimeError(f"HTTP error during Stream Load for {table_name}")
+        
+        result = response.json()
+        if result.get('Status') == 'Label Already Exists' and result.get('ExistingJobStatus') == 'FINISHED':
+            # An earlier attempt committed but its response was lost
+            self.logger.info(f"Stream Load {headers['label']} already finished")
+            return result
+        if result.get('Status') != 'Success':
+            self.logger.error(f"Stream Load failed: {result}")
+            raise RuntimeError(f"Stream Load failed for {table_name}")
+        return result
 
 
+# StarRocks schema, run as one multi-statement script
+STARROCKS_DDL = (
+    "DROP DATABASE IF EXISTS `{database}`",
+    "CREATE DATABASE `{database}`",
+    "USE `{database}`",
+    """CREATE TABLE `airlines` (
+      `iata_code` varchar(2),
+      `airline` varchar(30)
+    ) DUPLICATE KEY(`iata_code`)
+    DISTRIBUTED BY HASH(`iata_code`)
+    PROPERTIES (
+      "replication_num" = "1"
+    )""",
+    """CREATE TABLE `airports` (
+      `iata_code` varchar(3),
+      `airport` varchar(80),
+      `city` varchar(30),
+      `state` varchar(2),
+      `country` varchar(30),
+      `latitude` decimal(11,4),
+      `longitude` decimal(11,4)
+    ) DUPLICATE KEY(`iata_code`)
+    DISTRIBUTED BY HASH(`iata_code`)
+    PROPERTIES (
+      "replication_num" = "1"
+    )""",
+    """CREATE TABLE `flights` (
+      `year` smallint(6),
+      `month` tinyint(4),
+      `day` tinyint(4),
+      `day_of_week` tinyint(4),
+      `fl_date` date,
+      `carrier` varchar(2),
+      `tail_num` varchar(6),
+      `fl_num` smallint(6),
+      `origin` varchar(5),
+      `dest` varchar(5),
+      `crs_dep_time` varchar(4),
+      `dep_time` varchar(4),
+      `dep_delay` decimal(13,2),
+      `taxi_out` decimal(13,2),
+      `wheels_off` varchar(4),
+      `wheels_on` varchar(4),
+      `taxi_in` decimal(13,2),
+      `crs_arr_time` varchar(4),
+      `arr_time` varchar(4),
+      `arr_delay` decimal(13,2),
+      `cancelled` decimal(13,2),
+      `cancellation_code` varchar(20),
+      `diverted` decimal(13,2),
+      `crs_elapsed_time` decimal(13,2),
+      `actual_elapsed_time` decimal(13,2),
+      `air_time` decimal(13,2),
+      `distance` decimal(13,2),
+      `carrier_delay` decimal(13,2),
+      `weather_delay` decimal(13,2),
+      `nas_delay` decimal(13,2),
+      `security_delay` decimal(13,2),
+      `late_aircraft_delay` decimal(13,2)
+    ) DUPLICATE KEY(`year`, `month`, `day`, `day_of_week`)
+    DISTRIBUTED BY HASH(`fl_date`)
+    PROPERTIES (
+      "replication_num" = "1"
+    )"""
+)
+
 class StarRocksLoader(DatabaseLoader):
     
     def __init__(self, config: DatabaseConfig):
         super().__init__(config)
         self.base_url = f"http://{config.user}:{config.password}@{config.host}:8040/api/{config.database}"
+        
+        # Keep-alive connections for the Stream Load PUTs, sized for every
+        # table and split range being loaded at once; transient overload
+        # responses are retried by urllib3 with backoff. The body is a
+        # FileRange, which restarts from its first byte when resent.
+        pool_size = max(1, config.stream_load_workers) * STREAM_LOAD_PARTS
+        retries = Retry(total=MAX_RETRIES, backoff_factor=0.5,
+                        status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+        self._session = requests.Session()
+        self._session.auth = (config.user, config.password)
+        self._session.mount('http://', HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                                   max_retries=retries))
+        self._pool = None
+        # Position of the Alive column in SHOW BACKENDS, which moves
+        # between StarRocks versions; looked up on the first probe
+        self._alive_index = None
+    
+    def close(self) -> None:
+        self._session.close()
     
     @contextmanager
     def _get_connection(self):
-        import mysql.connector
-        from mysql.connector import Error
+        require_mysql_connector()
         
         connection = None
         try:
-            connection = mysql.connector.connect(
-                host=self.config.host,
-                user=self.config.user,
-                password=self.config.password,
-                port=self.config.port,
-                connection_timeout=CONNECTION_TIMEOUT,
-                autocommit=True
-            )
+            # Created on the first successful connect; the readiness probes
+            # and per-table row counts then reuse pooled connections
+            if self._pool is None:
+                self._pool = MySQLConnectionPool(
+                    pool_name="starrocks_loader",
+                    pool_size=MYSQL_POOL_SIZE,
+                    pool_reset_session=MYSQL_POOL_RESET_SESSION,
+                    host=self.config.host,
+                    user=self.config.user,
+                    password=self.config.password,
+                    port=self.config.port,
+                    connection_timeout=CONNECTION_TIMEOUT,
+                    autocommit=True,
+                    client_flags=[mysql.connector.ClientFlag.MULTI_STATEMENTS]
+                )
+            connection = self._pool.get_connection()
             yield connection
-        except Error as e:
+        except MySQLError as e:
             self.logger.error(f"Database connection error: {e}")
             raise
         finally:
-            if connection and connection.is_connected():
-                connection.close()
+            if connection:
+                try:
+                    # Returns the connection to the pool
+                    connection.close()
+                except MySQLError:
+                    pass
 
     def test_connection(self) -> bool:
+        # Until the FE accepts TCP there is no point in a MySQL handshake
+        if not port_open(self.config.host, self.config.port):
+            self.logger.debug(f"Port {self.config.port} not accepting connections yet")
+            return False
+        
         try:
             with self._get_connection() as connection:
                 if connection.is_connected():
                     cursor = connection.cursor()
                     try:
-                        # Check basic connectivity
-                        cursor.execute("SELECT 1")
-                        cursor.fetchone()
-                        
-                        # Check if backend nodes are available
+                        # Check if backend nodes are available; a successful
+                        # query also proves basic connectivity
                         cursor.execute("SHOW BACKENDS")
-                        backends = cursor.fetchall()
+                        
+                        if self._alive_index is None:
+                            columns = [column[0].lower() for column in cursor.description]
+                            self._alive_index = columns.index('alive')
+                        
+                        # Rows are streamed (the cursor is unbuffered), so stop
+                        # at the first alive backend and just drain the rest
+                        backends = 0
+                        alive = False
+                        for backend in cursor:
+                            backends += 1
+                            if str(backend[self._alive_index]).lower() == 'true':
+                                alive = True
+                                break
+                        cursor.fetchall()
                         
                         if not backends:
                             self.logger.debug("No backend nodes found")
                             return False
-                            
-                        # Check if at least one backend is alive
-                        alive_backends = 0
-                        for backend in backends:
-                            # Backend status is typically in the 'Alive' column (index 8)
-                            if len(backend) > 8 and str(backend[8]).lower() == 'true':
-                                alive_backends += 1
                         
-                        if alive_backends == 0:
+                        if not alive:
                             self.logger.debug("No alive backend nodes found")
                             return False
                             
-                        self.logger.debug(f"Found {alive_backends} alive backend nodes")
+                        self.logger.debug("Found an alive backend node")
                         return True
                     except Exception as e:
                         self.logger.debug(f"Backend check failed: {e}")
@@ -889,11 +1602,12 @@ class StarRocksLoader(DatabaseLoader):
     def wait_for_connection(self, timeout: int = None) -> bool:
         """Wait for StarRocks to be ready"""
         if timeout is None:
-            timeout = 120  # StarRocks needs time for backend nodes to initialize
+            timeout = STARROCKS_TIMEOUT  # StarRocks needs time for backend nodes to initialize
             
         self.logger.info("Waiting for STARROCKS to be ready (frontend + backend nodes)...")
         start_time = time.time()
         last_log_time = start_time
+        attempt = 0
         
         while time.time() - start_time < timeout:
             try:
@@ -909,7 +1623,8 @@ class StarRocksLoader(DatabaseLoader):
                 self.logger.info(f"Still waiting for backend nodes... ({elapsed}s)")
                 last_log_time = current_time
             
-            time.sleep(5)
+            time.sleep(poll_delay(attempt))
+            attempt += 1
         
         self.logger.error(f"❌ Timeout after {timeout}s. Please check if STARROCKS is properly started.")
         return False
@@ -918,80 +1633,15 @@ class StarRocksLoader(DatabaseLoader):
         self.logger.info("Creating StarRocks database and tables...")
         
         # StarRocks-specific SQL
-        sql_commands = [
-            f"DROP DATABASE IF EXISTS `{self.config.database}`",
-            f"CREATE DATABASE `{self.config.database}`",
-            f"USE `{self.config.database}`",
-            """CREATE TABLE `airlines` (
-              `iata_code` varchar(2),
-              `airline` varchar(30)
-            ) DUPLICATE KEY(`iata_code`)
-            DISTRIBUTED BY HASH(`iata_code`)
-            PROPERTIES (
-              "replication_num" = "1"
-            )""",
-            """CREATE TABLE `airports` (
-              `iata_code` varchar(3),
-              `airport` varchar(80),
-              `city` varchar(30),
-              `state` varchar(2),
-              `country` varchar(30),
-              `latitude` decimal(11,4),
-              `longitude` decimal(11,4)
-            ) DUPLICATE KEY(`iata_code`)
-            DISTRIBUTED BY HASH(`iata_code`)
-            PROPERTIES (
-              "replication_num" = "1"
-            )""",
-            """CREATE TABLE `flights` (
-              `year` smallint(6),
-              `month` tinyint(4),
-              `day` tinyint(4),
-              `day_of_week` tinyint(4),
-              `fl_date` date,
-              `carrier` varchar(2),
-              `tail_num` varchar(6),
-              `fl_num` smallint(6),
-              `origin` varchar(5),
-              `dest` varchar(5),
-              `crs_dep_time` varchar(4),
-              `dep_time` varchar(4),
-              `dep_delay` decimal(13,2),
-              `taxi_out` decimal(13,2),
-              `wheels_off` varchar(4),
-              `wheels_on` varchar(4),
-              `taxi_in` decimal(13,2),
-              `crs_arr_time` varchar(4),
-              `arr_time` varchar(4),
-              `arr_delay` decimal(13,2),
-              `cancelled` decimal(13,2),
-              `cancellation_code` varchar(20),
-              `diverted` decimal(13,2),
-              `crs_elapsed_time` decimal(13,2),
-              `actual_elapsed_time` decimal(13,2),
-              `air_time` decimal(13,2),
-              `distance` decimal(13,2),
-              `carrier_delay` decimal(13,2),
-              `weather_delay` decimal(13,2),
-              `nas_delay` decimal(13,2),
-              `security_delay` decimal(13,2),
-              `late_aircraft_delay` decimal(13,2)
-            ) DUPLICATE KEY(`year`, `month`, `day`, `day_of_week`)
-            DISTRIBUTED BY HASH(`fl_date`)
-            PROPERTIES (
-              "replication_num" = "1"
-            )"""
-        ]
+        sql_commands = [sql.format(database=self.config.database) for sql in STARROCKS_DDL]
         
         try:
             with self._get_connection() as connection:
                 cursor = connection.cursor()
                 try:
-                    for i, command in enumerate(sql_commands, 1):
-                        if command.strip():
-                            self.logger.info(f"Executing command {i}/{len(sql_commands)}")
-                            cursor.execute(command)
-                            time.sleep(0.5)
+                    # One round trip for the whole schema; the FE applies DDL
+                    # synchronously, so no settle delay is needed in between
+                    execute_script(cursor, sql_commands)
                     self.logger.info("✅ Database and tables created successfully")
                 except Exception as e:
                     error_msg = str(e)
@@ -1017,13 +1667,25 @@ class StarRocksLoader(DatabaseLoader):
             "bts.flights.csv": "flights"
         }
         
+        # Each table is an independent PUT, so the small tables load while
+        # flights is still streaming
+        workers = threading.BoundedSemaphore(max(1, self.config.stream_load_workers))
+        futures = []
         for csv_file, table_name in file_table_mapping.items():
             csv_file_path = csv_dir / csv_file
             if csv_file_path.exists():
-                self._load_file_via_stream_load(csv_file_path, table_name)
+                future = submit_io(self._load_file_via_stream_load, csv_file_path, table_name, limit=workers)
+                futures.append(future)
             else:
                 self.logger.warning(f"{csv_file} not found, skipping...")
         
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"Error in concurrent loading: {e}")
+                raise
+        
         self.logger.info("✅ All data loaded successfully into StarRocks!")
 
     def _load_file_via_stream_load(self, csv_file_path: Path, table_name: str) -> None:
@@ -1033,7 +1695,9 @@ class StarRocksLoader(DatabaseLoader):
         start_time = time.time()
         url = f"http://{self.config.host}:8040/api/{self.config.database}/{table_name}/_stream_load"
         
-        # StarRocks-optimized headers
+        # StarRocks-optimized headers. No Expect: 100-continue, since the BE is
+        # addressed directly (no FE redirect to wait for) and the client
+        # sends the body without waiting for the interim response anyway
         headers = {
             'label': f'starrocks_load_{table_name}_{int(start_time)}',
             'format': 'csv',
@@ -1041,7 +1705,6 @@ class StarRocksLoader(DatabaseLoader):
             'timeout': '600',
             'max_filter_ratio': '0.1',
             'strict_mode': 'false',
-            'Expect': '100-continue',
             'Content-Type': 'text/plain'
         }
         
@@ -1057,43 +1720,129 @@ class StarRocksLoader(DatabaseLoader):
             })
         
         try:
-            with open(csv_file_path, 'rb') as f:
-                response = requests.put(
-                    url,
-                    headers=headers,
-                    data=f,
-                    auth=(self.config.user, self.config.password),
-                    timeout=600
-                )
+            # Large files are split on row boundaries and sent as concurrent
+            # Stream Loads with their own labels, so several BE write
+            # threads ingest flights at once
+            file_size = csv_file_path.stat().st_size
+            if file_size > STREAM_LOAD_SPLIT_THRESHOLD:
+                parts = max(STREAM_LOAD_PARTS, math.ceil(file_size / STREAM_LOAD_MAX_RANGE_BYTES))
+                ranges = split_csv_offsets(csv_file_path, parts)
+            else:
+                ranges = [(0, file_size)]
             
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('Status') == 'Success':
-                    total_time = time.time() - start_time
-                    
-                    try:
-                        with self._get_connection() as connection:
-                            cursor = connection.cursor()
-                            cursor.execute(f"SELECT COUNT(*) FROM {self.config.database}.{table_name}")
-                            row_count = cursor.fetchone()[0]
-                            cursor.close()
-                            
-                        avg_rate = row_count / total_time if total_time > 0 else 0
-                        self.logger.info(f"✅ Successfully loaded {row_count:,} rows in {total_time:.1f}s "
-                                       f"(avg {avg_rate:,.0f} rows/sec)")
-                    except Exception as e:
-                        self.logger.info(f"✅ File loaded successfully in {total_time:.1f}s")
-                        self.logger.warning(f"Could not get row count: {e}")
-                else:
-                    self.logger.error(f"Stream Load failed: {result}")
-                    raise RuntimeError(f"Stream Load failed for {table_name}")
+            if len(ranges) == 1:
+                results = [self._stream_load_range(url, table_name, headers, csv_file_path, *ranges[0])]
             else:
-                self.logger.error(f"HTTP error {response.status_code}: {response.text}")
-                raise RuntimeError(f"HTTP error during Stream Load for {table_name}")
+                self.logger.info(f"Splitting {csv_file_path.name} into {len(ranges)} Stream Loads")
+                with ThreadPoolExecutor(max_workers=min(len(ranges), STREAM_LOAD_PARTS)) as executor:
+                    futures = [
+                        executor.submit(
+                            self._stream_load_range, url, table_name,
+                            {**headers, 'label': f"{headers['label']}_{i}"},
+                            csv_file_path, range_start, range_end
+                        )
+                        for i, (range_start, range_end) in enumerate(ranges)
+                    ]
+                    results = [future.result() for future in as_completed(futures)]
+            
+            # Counted from the Stream Load responses rather than a
+            # COUNT(*) scan of the freshly loaded table
+            log_stream_load_results(self.logger, results, time.time() - start_time)
                 
         except Exception as e:
             self.logger.error(f"Error loading {csv_file_path}: {e}")
             raise
+    
+    def _stream_load_range(self, url: str, table_name: str, headers: Dict[str, str],
+                           csv_file_path: Path, start: int, end: int) -> Dict[str, Any]:
+        """Send bytes [start, end) of a CSV file as one Stream Load request.
+        
+        Transient failures are retried by the session's urllib3 adapter with
+        the same label, so StarRocks never applies one range twice.
+        """
+        # Sent in STREAM_LOAD_CHUNK_BYTES blocks with a Content-Length
+        # header rather than requests' small default reads of a file object
+        with FileRange(csv_file_path, start, end) as body:
+            if self.config.stream_load_compress:
+                # Decompressed on the BE; older StarRocks versions that
+                # lack the header need compression left off
+                body = GzipBody(body)
+                headers = {**headers, 'compression': 'gzip'}
+            response = self._session.put(
+                url,
+                headers=headers,
+                data=body,
+                timeout=600
+            )
+        
+        if response.status_code != 200:
+            self.logger.error(f"HTTP error {response.status_code}: {response.text}")
+            raise RuntimeError(f"HTTP error during Stream Load for {table_name}")
+        
+        result = response.json()
+        if result.get('Status') == 'Label Already Exists' and result.get('ExistingJobStatus') == 'FINISHED':
+            # An earlier attempt committed but its response was lost
+            self.logger.info(f"Stream Load {headers['label']} already finished")
+            return result
+        if result.get('Status') != 'Success':
+            self.logger.error(f"Stream Load failed: {result}")
+            raise RuntimeError(f"Stream Load failed for {table_name}")
+        
+        return result
+
+# ColumnStore schema, run as one multi-statement script
+COLUMNSTORE_DDL = (
+    "DROP DATABASE IF EXISTS `{database}`",
+    "CREATE DATABASE `{database}`",
+    "USE `{database}`",
+    """CREATE TABLE airlines (
+        iata_code varchar(2) DEFAULT NULL,
+        airline varchar(30) DEFAULT NULL
+    ) ENGINE=ColumnStore""",
+    """CREATE TABLE airports (
+        iata_code varchar(3) DEFAULT NULL,
+        airport varchar(80) DEFAULT NULL,
+        city varchar(30) DEFAULT NULL,
+        state varchar(2) DEFAULT NULL,
+        country varchar(30) DEFAULT NULL,
+        latitude decimal(11,4) DEFAULT NULL,
+        longitude decimal(11,4) DEFAULT NULL
+    ) ENGINE=ColumnStore""",
+    """CREATE TABLE flights (
+        year smallint(6) DEFAULT NULL,
+        month tinyint(4) DEFAULT NULL,
+        day tinyint(4) DEFAULT NULL,
+        day_of_week tinyint(4) DEFAULT NULL,
+        fl_date date DEFAULT NULL,
+        carrier varchar(2) DEFAULT NULL,
+        tail_num varchar(6) DEFAULT NULL,
+        fl_num smallint(6) DEFAULT NULL,
+        origin varchar(5) DEFAULT NULL,
+        dest varchar(5) DEFAULT NULL,
+        crs_dep_time varchar(4) DEFAULT NULL,
+        dep_time varchar(4) DEFAULT NULL,
+        dep_delay decimal(13,2) DEFAULT NULL,
+        taxi_out decimal(13,2) DEFAULT NULL,
+        wheels_off varchar(4) DEFAULT NULL,
+        wheels_on varchar(4) DEFAULT NULL,
+        taxi_in decimal(13,2) DEFAULT NULL,
+        crs_arr_time varchar(4) DEFAULT NULL,
+        arr_time varchar(4) DEFAULT NULL,
+        arr_delay decimal(13,2) DEFAULT NULL,
+        cancelled decimal(13,2) DEFAULT NULL,
+        cancellation_code varchar(20) DEFAULT NULL,
+        diverted decimal(13,2) DEFAULT NULL,
+        crs_elapsed_time decimal(13,2) DEFAULT NULL,
+        actual_elapsed_time decimal(13,2) DEFAULT NULL,
+        air_time decimal(13,2) DEFAULT NULL,
+        distance decimal(13,2) DEFAULT NULL,
+        carrier_delay decimal(13,2) DEFAULT NULL,
+        weather_delay decimal(13,2) DEFAULT NULL,
+        nas_delay decimal(13,2) DEFAULT NULL,
+        security_delay decimal(13,2) DEFAULT NULL,
+        late_aircraft_delay decimal(13,2) DEFAULT NULL
+    ) ENGINE=ColumnStore"""
+)
 
 class ColumnStoreLoader(DatabaseLoader):
     """
@@ -1110,54 +1859,94 @@ class ColumnStoreLoader(DatabaseLoader):
         if config.user == 'root' and config.password == '':
             self.config.user = 'admin'
             self.config.password = 'C0lumnStore!'
+        self._pool = None
+        # Set once `docker ps` has shown mcs1 running, so later steps skip the check
+        self._container_verified = False
     
-    def test_connection(self) -> bool:
-        try:
-            import mysql.connector
-            from mysql.connector import Error
-            
-            connection = mysql.connector.connect(
+    @contextmanager
+    def _get_connection(self):
+        require_mysql_connector()
+        
+        # Created on the first successful connect, so the readiness probes,
+        # DDL and per-table row counts share a few pooled connections. The
+        # collation is set explicitly because the connector's default,
+        # utf8mb4_0900_ai_ci, does not exist in MariaDB; the C extension is
+        # requested explicitly too
+        if self._pool is None:
+            self._pool = MySQLConnectionPool(
+                pool_name="columnstore_loader",
+                pool_size=MYSQL_POOL_SIZE,
+                pool_reset_session=MYSQL_POOL_RESET_SESSION,
                 host=self.config.host,
                 port=self.config.port,
                 user=self.config.user,
                 password=self.config.password,
-                connection_timeout=10,
                 charset='utf8mb4',
-                collation='utf8mb4_general_ci'
+                collation='utf8mb4_general_ci',
+                connection_timeout=10,
+                use_pure=False,
+                client_flags=[mysql.connector.ClientFlag.MULTI_STATEMENTS]
             )
-            cursor = connection.cursor()
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-            cursor.close()
+        connection = self._pool.get_connection()
+        try:
+            yield connection
+        finally:
+            # Returns the connection to the pool
             connection.close()
+    
+    def test_connection(self) -> bool:
+        if not port_open(self.config.host, self.config.port):
+            self.logger.debug(f"Port {self.config.port} not accepting connections yet")
+            return False
+        
+        try:
+            with self._get_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+                cursor.close()
             return True
         except Exception as e:
             self.logger.debug(f"Connection test failed: {e}")
             return False
     
+    def _require_container(self) -> None:
+        """Raise RuntimeError unless the mcs1 container is running; checked once per loader"""
+        if self._container_verified:
+            return
+        
+        try:
+            result = subprocess.run(
+                ["docker", "ps", "--filter", "name=mcs1", "--format", "{{.Names}}"],
+                capture_output=True, text=True, check=True
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            raise RuntimeError(f"Could not check Docker container status: {e}")
+        
+        if 'mcs1' not in result.stdout:
+            raise RuntimeError("MariaDB ColumnStore container 'mcs1' not found or not running. "
+                               "Please start it with: docker compose -f docker/columnstore.yml up -d")
+        self._container_verified = True
+    
     def _ensure_columnstore_provisioned(self) -> bool:
         """Ensure ColumnStore is provisioned before attempting connections"""
         self.logger.info("Ensuring MariaDB ColumnStore is provisioned...")
         
         # Check if container exists and is running
         try:
-            result = subprocess.run(
-                'docker ps --filter "name=mcs1" --format "{{.Names}}"', 
-                shell=True, capture_output=True, text=True, check=True
-            )
-            if 'mcs1' not in result.stdout:
-                self.logger.error("MariaDB ColumnStore container 'mcs1' not found or not running")
-                self.logger.error("Please start it with: docker compose -f docker/columnstore.yml up -d")
-                return False
-        except subprocess.CalledProcessError:
-            self.logger.error("Could not check Docker container status")
+            self._require_container()
+        except RuntimeError as e:
+            self.logger.error(str(e))
             return False
         
         # Try to provision ColumnStore (this may fail if already provisioned, which is fine)
         self.logger.info("Provisioning MariaDB ColumnStore...")
+        # Run directly as argv: no host shell, and no container shell just
+        # to invoke one command. A non-zero exit is expected when the
+        # cluster was provisioned on an earlier run
         provision_result = subprocess.run(
-            'docker exec mcs1 sh -c "provision mcs1" 2>/dev/null || true',
-            shell=True, capture_output=True, text=True
+            ["docker", "exec", "mcs1", "provision", "mcs1"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
         if provision_result.returncode == 0:
             self.logger.info("✓ MariaDB ColumnStore provisioned successfully")
@@ -1175,6 +1964,7 @@ class ColumnStoreLoader(DatabaseLoader):
         
         start_time = time.time()
         last_progress = start_time
+        attempt = 0
         
         while time.time() - start_time < timeout:
             if self.test_connection():
@@ -1190,7 +1980,8 @@ class ColumnStoreLoader(DatabaseLoader):
                 self.logger.info(f"Still waiting for connection... ({elapsed:.0f}s elapsed, {remaining:.0f}s remaining)")
                 last_progress = current_time
             
-            time.sleep(2)
+            time.sleep(poll_delay(attempt))
+            attempt += 1
         
         self.logger.error(f"⏰ Timeout waiting for MariaDB ColumnStore connection after {timeout}s")
         return False
@@ -1199,80 +1990,17 @@ class ColumnStoreLoader(DatabaseLoader):
         self.logger.info("Creating MariaDB ColumnStore database and tables...")
         
         # Create database and tables using direct SQL
-        sql_commands = [
-            "DROP DATABASE IF EXISTS bts",
-            "CREATE DATABASE bts",
-            "USE bts",
-            """CREATE TABLE airlines (
-                iata_code varchar(2) DEFAULT NULL,
-                airline varchar(30) DEFAULT NULL
-            ) ENGINE=ColumnStore""",
-            """CREATE TABLE airports (
-                iata_code varchar(3) DEFAULT NULL,
-                airport varchar(80) DEFAULT NULL,
-                city varchar(30) DEFAULT NULL,
-                state varchar(2) DEFAULT NULL,
-                country varchar(30) DEFAULT NULL,
-                latitude decimal(11,4) DEFAULT NULL,
-                longitude decimal(11,4) DEFAULT NULL
-            ) ENGINE=ColumnStore""",
-            """CREATE TABLE flights (
-                year smallint(6) DEFAULT NULL,
-                month tinyint(4) DEFAULT NULL,
-                day tinyint(4) DEFAULT NULL,
-                day_of_week tinyint(4) DEFAULT NULL,
-                fl_date date DEFAULT NULL,
-                carrier varchar(2) DEFAULT NULL,
-                tail_num varchar(6) DEFAULT NULL,
-                fl_num smallint(6) DEFAULT NULL,
-                origin varchar(5) DEFAULT NULL,
-                dest varchar(5) DEFAULT NULL,
-                crs_dep_time varchar(4) DEFAULT NULL,
-                dep_time varchar(4) DEFAULT NULL,
-                dep_delay decimal(13,2) DEFAULT NULL,
-                taxi_out decimal(13,2) DEFAULT NULL,
-                wheels_off varchar(4) DEFAULT NULL,
-                wheels_on varchar(4) DEFAULT NULL,
-                taxi_in decimal(13,2) DEFAULT NULL,
-                crs_arr_time varchar(4) DEFAULT NULL,
-                arr_time varchar(4) DEFAULT NULL,
-                arr_delay decimal(13,2) DEFAULT NULL,
-                cancelled decimal(13,2) DEFAULT NULL,
-                cancellation_code varchar(20) DEFAULT NULL,
-                diverted decimal(13,2) DEFAULT NULL,
-                crs_elapsed_time decimal(13,2) DEFAULT NULL,
-                actual_elapsed_time decimal(13,2) DEFAULT NULL,
-                air_time decimal(13,2) DEFAULT NULL,
-                distance decimal(13,2) DEFAULT NULL,
-                carrier_delay decimal(13,2) DEFAULT NULL,
-                weather_delay decimal(13,2) DEFAULT NULL,
-                nas_delay decimal(13,2) DEFAULT NULL,
-                security_delay decimal(13,2) DEFAULT NULL,
-                late_aircraft_delay decimal(13,2) DEFAULT NULL
-            ) ENGINE=ColumnStore"""
-        ]
+        sql_commands = [sql.format(database=self.config.database) for sql in COLUMNSTORE_DDL]
         
         try:
-            import mysql.connector
-            from mysql.connector import Error
-            
-            connection = mysql.connector.connect(
-                host=self.config.host,
-                port=self.config.port,
-                user=self.config.user,
-                password=self.config.password,
-                charset='utf8mb4',
-                collation='utf8mb4_general_ci'
-            )
-            cursor = connection.cursor()
-            
-            for sql_command in sql_commands:
-                self.logger.debug(f"Executing: {sql_command[:50]}...")
-                cursor.execute(sql_command)
-            
-            connection.commit()
-            cursor.close()
-            connection.close()
+            with self._get_connection() as connection:
+                cursor = connection.cursor()
+                
+                # The whole schema in one multi-statement round trip
+                execute_script(cursor, sql_commands)
+                
+                connection.commit()
+                cursor.close()
             self.logger.info("✅ Database and tables created successfully")
             
         except Exception as e:
@@ -1282,17 +2010,8 @@ class ColumnStoreLoader(DatabaseLoader):
     def load_data(self, csv_dir: Path) -> None:
         self.logger.info("Loading data into MariaDB ColumnStore...")
         
-        # Check if container exists first
-        try:
-            result = subprocess.run(
-                'docker ps --filter "name=mcs1" --format "{{.Names}}"', 
-                shell=True, capture_output=True, text=True, check=True
-            )
-            if 'mcs1' not in result.stdout:
-                raise RuntimeError("MariaDB ColumnStore container 'mcs1' not found or not running. "
-                                 "Please start it with: docker compose -f docker/columnstore.yml up -d")
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Could not check Docker container status: {e}")
+        # Check if container exists first (already done if wait_for_connection ran)
+        self._require_container()
         
         # Verify CSV files exist (no copying needed since they're mounted as a volume)
         csv_files = ["bts.airlines.csv", "bts.airports.csv", "bts.flights.csv"]
@@ -1300,14 +2019,21 @@ class ColumnStoreLoader(DatabaseLoader):
             csv_path = csv_dir / csv_file
             if not csv_path.exists():
                 raise FileNotFoundError(f"Required CSV file not found: {csv_path}")
+            # The mount shares the host's page cache on Linux, so cpimport
+            # reads what this has already pulled in
+            prefetch_file(csv_path)
         
         self.logger.info("Using mounted CSV directory for data import (faster than copying files)")
         
-        # Import data using cpimport with mounted CSV directory
+        # Import data using cpimport with mounted CSV directory; each table
+        # is a separate cpimport process, so they can run side by side
         tables = ["airlines", "airports", "flights"]
-        for i, table in enumerate(tables):
-            csv_file = csv_files[i]
-            self._load_table(table, csv_file)
+        futures = [
+            submit_io(self._load_table, table, csv_file)
+            for table, csv_file in zip(tables, csv_files)
+        ]
+        for future in as_completed(futures):
+            future.result()
         
         self.logger.info("✅ All data loaded successfully into MariaDB ColumnStore!")
     
@@ -1317,10 +2043,15 @@ class ColumnStoreLoader(DatabaseLoader):
         
         start_time = time.time()
         
-        # Use cpimport with mounted CSV directory (/var/lib/columnstore/csv)
+        # Use cpimport with mounted CSV directory (COLUMNSTORE_CSV_DIR).
+        # Passed as argv, so neither a host shell nor a container shell is
+        # started just to parse the quoting. Its stdout is progress output
+        # nobody reads, so it is discarded; stderr is kept for error reporting
+        options = COLUMNSTORE_FLIGHTS_CPIMPORT_OPTIONS if table_name == 'flights' else []
         result = subprocess.run(
-            f'docker exec mcs1 sh -c "cpimport -s \\",\\" -E \'\\\"\' bts {table_name} /var/lib/columnstore/csv/{csv_file}"',
-            shell=True, capture_output=True, text=True
+            ["docker", "exec", "mcs1", "cpimport", "-s", ",", "-E", '"', *options,
+             self.config.database, table_name, f"{COLUMNSTORE_CSV_DIR}/{csv_file}"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
         )
         
         if result.returncode != 0:
@@ -1334,21 +2065,11 @@ class ColumnStoreLoader(DatabaseLoader):
         
         # Get row count for success reporting
         try:
-            import mysql.connector
-            connection = mysql.connector.connect(
-                host=self.config.host,
-                port=self.config.port,
-                user=self.config.user,
-                password=self.config.password,
-                database=self.config.database,
-                charset='utf8mb4',
-                collation='utf8mb4_general_ci'
-            )
-            cursor = connection.cursor()
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            row_count = cursor.fetchone()[0]
-            cursor.close()
-            connection.close()
+            with self._get_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(f"SELECT COUNT(*) FROM {self.config.database}.{table_name}")
+                row_count = cursor.fetchone()[0]
+                cursor.close()
             
             avg_rate = row_count / total_time if total_time > 0 else 0
             
@@ -1399,6 +2120,18 @@ def main() -> None:
                        help='Logging level')
     parser.add_argument('--connection-timeout', type=int, default=60,
                        help='Timeout in seconds for database connection attempts')
+    parser.add_argument('--clickhouse-http-port', type=int, default=CLICKHOUSE_HTTP_PORT,
+                       help='ClickHouse HTTP interface port, used for the CSV INSERTs')
+    parser.add_argument('--tidb-import', choices=['lightning', 'local-infile'], default='lightning',
+                       help='How TiDB loads the CSV files: TiDB Lightning via tiup, or LOAD DATA LOCAL INFILE')
+    parser.add_argument('--stream-load-workers', type=int, default=3,
+                       help='Maximum number of concurrent Stream Load requests (Doris, StarRocks)')
+    parser.add_argument('--stream-load-compress', action='store_true',
+                       help='Gzip Stream Load request bodies on the fly (Doris, StarRocks); helps over real networks, not on localhost')
+    parser.add_argument('--no-stream-load-sendfile', dest='stream_load_sendfile', action='store_false',
+                       help='Send uncompressed Stream Load bodies through requests instead of sendfile(2) (Doris)')
+    parser.add_argument('--download', action='store_true',
+                       help='Download missing CSV files first; with Doris each file is loaded as soon as it arrives')
     
     args = parser.parse_args()
     
@@ -1410,48 +2143,66 @@ def main() -> None:
     logger.info(f"🚀 Starting {args.database.upper()} data loading")
     
     try:
-        csv_dir = verify_csv_files()
+        if args.download:
+            csv_dir = CSV_DIR
+            ready = download_csv_files_in_background(csv_dir)
+        else:
+            csv_dir = verify_csv_files()
+            ready = None
         
         config = DatabaseConfig(
             host=args.host,
             port=args.port,
             user=args.user,
             password=args.password,
-            database=args.database_name
+            database=args.database_name,
+            stream_load_workers=args.stream_load_workers,
+            stream_load_compress=args.stream_load_compress,
+            stream_load_sendfile=args.stream_load_sendfile,
+            tidb_import=args.tidb_import,
+            clickhouse_http_port=args.clickhouse_http_port
         )
         
         loader = create_loader(args.database, config)
         
-        # Wait for database to be ready
-        if args.database in ['starrocks', 'doris', 'columnstore'] and hasattr(loader, 'wait_for_connection'):
-            if not loader.wait_for_connection(args.connection_timeout):
-                logger.error(f"Could not connect to {args.database}. Please ensure it is running and ready.")
+        with loader:
+            # Wait for database to be ready
+            if args.database in ['starrocks', 'doris', 'columnstore'] and hasattr(loader, 'wait_for_connection'):
+                if not loader.wait_for_connection(args.connection_timeout):
+                    logger.error(f"Could not connect to {args.database}. Please ensure it is running and ready.")
+                    sys.exit(1)
+            elif args.database == 'tidb' and hasattr(loader, 'wait_for_connection'):
+                if not loader.wait_for_connection():
+                    logger.error("Could not connect to TiDB. Please ensure TiDB is running.")
+                    sys.exit(1)
+            elif hasattr(loader, 'test_connection') and not loader.test_connection():
+                logger.error(f"Could not connect to {args.database}. Please ensure it is running.")
                 sys.exit(1)
-        elif args.database == 'tidb' and hasattr(loader, 'wait_for_connection'):
-            if not loader.wait_for_connection():
-                logger.error("Could not connect to TiDB. Please ensure TiDB is running.")
-                sys.exit(1)
-        elif hasattr(loader, 'test_connection') and not loader.test_connection():
-            logger.error(f"Could not connect to {args.database}. Please ensure it is running.")
-            sys.exit(1)
-        
-        total_start_time = time.time()
-        
-        if not args.skip_schema:
-            logger.info("Creating database and tables...")
-            loader.create_database_and_tables()
-        else:
-            logger.info("Skipping database and table creation")
-        
-        logger.info("Starting data loading...")
-        loader.load_data(csv_dir)
-        
-        if args.database == 'tidb' and hasattr(loader, 'set_tiflash_replica'):
-            logger.info("Setting TiFlash replica...")
-            loader.set_tiflash_replica()
-        
-        total_time = time.time() - total_start_time
-        logger.info(f"🎉 {args.database.upper()} data loading completed successfully in {total_time:.2f} seconds")
+            
+            total_start_time = time.time()
+            
+            if not args.skip_schema:
+                logger.info("Creating database and tables...")
+                loader.create_database_and_tables()
+            else:
+                logger.info("Skipping database and table creation")
+            
+            logger.info("Starting data loading...")
+            if ready is not None and isinstance(loader, DorisLoader):
+                loader.load_data(csv_dir, ready)
+            else:
+                if ready is not None:
+                    logger.info("Waiting for CSV downloads to finish...")
+                    drain_queue(ready)
+                    verify_csv_files()
+                loader.load_data(csv_dir)
+            
+            if args.database == 'tidb' and hasattr(loader, 'set_tiflash_replica'):
+                logger.info("Setting TiFlash replica...")
+                loader.set_tiflash_replica()
+            
+            total_time = time.time() - total_start_time
+            logger.info(f"🎉 {args.database.upper()} data loading completed successfully in {total_time:.2f} seconds")
         
     except KeyboardInterrupt:
         logger.warning("Operation cancelled by user")
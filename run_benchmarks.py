@@ -1,26 +1,35 @@
 import mysql.connector
+from mysql.connector.pooling import MySQLConnectionPool
 import os
+import re
 import time
 import sys
 import argparse
 from typing import Dict, List, Tuple, Optional
-from contextlib import contextmanager
+from contextlib import contextmanager, ExitStack
 import logging
 import difflib
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
+DATABASE_CHOICES = ('doris', 'starrocks', 'clickhouse', 'tidb', 'columnstore')
+
 class DatabaseChoiceAction(argparse.Action):
     """Custom action that provides suggestions for invalid database choices"""
     
     def __call__(self, parser, namespace, values, option_string=None):
-        valid_choices = ['doris', 'starrocks', 'clickhouse', 'tidb', 'columnstore']
+        valid_choices = DATABASE_CHOICES
         
         if values not in valid_choices:
-            # Find closest matches
-            close_matches = difflib.get_close_matches(values, valid_choices, n=3, cutoff=0.6)
+            # Prefer a prefix match (e.g. 'click'); fall back to
+            # difflib's fuzzy matching only for real typos
+            close_matches = [choice for choice in valid_choices if choice.startswith(values)]
+            if not close_matches:
+                close_matches = difflib.get_close_matches(values, valid_choices, n=3, cutoff=0.6)
             error_msg = f"invalid choice: '{values}' (choose from {', '.join(valid_choices)})"
             
             if close_matches:
@@ -78,10 +87,61 @@ DATABASE_CONNECTIONS = {
 
 MAX_RETRIES = 3
 RETRY_DELAY = 5
+FETCH_BATCH_SIZE = 10000  # rows read per round when draining a result set
+POOL_SIZE = 1  # queries run one at a time; the pool only saves reconnects
+
+# Quoted strings, identifiers and comments are matched whole, so only the
+# semicolons left over separate statements
+SQL_TOKEN_PATTERN = re.compile(r"""
+    '(?:[^'\\]|\\.|'')*'
+  | "(?:[^"\\]|\\.|"")*"
+  | `(?:[^`]|``)*`
+  | --(?=\s|$)[^\n]*
+  | \#[^\n]*
+  | /\*.*?\*/
+  | ;
+""", re.VERBOSE | re.DOTALL)
+# MySQL only treats -- as a comment when whitespace follows it
+SQL_COMMENT_PATTERN = re.compile(r"--(?=\s|$)[^\n]*|#[^\n]*|/\*.*?\*/", re.DOTALL)
+
+# Error message classifiers, each a single case-insensitive scan
+AUTH_ERROR_PATTERN = re.compile(r"access denied|authentication|unknown user|user|password|denied", re.IGNORECASE)
+MEMORY_ERROR_PATTERN = re.compile(r"mem_limit_exceeded|memory not enough", re.IGNORECASE)
+TIMEOUT_ERROR_PATTERN = re.compile(r"timeout|cancelled", re.IGNORECASE)
+# CR_SERVER_GONE_ERROR, CR_SERVER_LOST, CR_SERVER_LOST_EXTENDED
+CONNECTION_LOST_ERRNOS = (2006, 2013, 2055)
+
+def split_sql_statements(sql_script: str) -> List[str]:
+    """Split a script on semicolons outside quotes and comments, in one pass"""
+    statements = []
+    start = 0
+    for match in SQL_TOKEN_PATTERN.finditer(sql_script):
+        if match.group() == ';':
+            statements.append(sql_script[start:match.start()])
+            start = match.end()
+    statements.append(sql_script[start:])
+    
+    # Drop pieces that hold nothing but whitespace and comments
+    return [stmt.strip() for stmt in statements if SQL_COMMENT_PATTERN.sub('', stmt).strip()]
+
+def count_only(statement: str) -> str:
+    """Wrap a query so the server runs it but returns a single row.
+    
+    Used for --measure backend-only: the time then excludes sending and
+    decoding the result set. The optimizer may drop work whose output is
+    never read (a final ORDER BY, unused columns), so these timings are a
+    lower bound rather than a like-for-like replacement.
+    """
+    keyword = SQL_COMMENT_PATTERN.sub('', statement).split(None, 1)[0].upper()
+    if keyword not in ('SELECT', 'WITH'):
+        return statement
+    # The newline keeps a trailing -- comment from swallowing the ")"
+    return f"SELECT COUNT(*) FROM (\n{statement}\n) AS benchmark_result"
 
 class DatabaseBenchmark:
-    def __init__(self, database_type: str, config_overrides: Dict = None):
+    def __init__(self, database_type: str, config_overrides: Dict = None, measure: str = 'end-to-end'):
         self.database_type = database_type
+        self.measure = measure
         self.db_config = DATABASE_CONNECTIONS[database_type].copy()
         
         if config_overrides:
@@ -89,32 +149,57 @@ class DatabaseBenchmark:
         
         self.conn = None
         self.cursor = None
+        self._pool = None
+        self._scripts: Dict[str, str] = {}
         
     @contextmanager
     def connection(self):
         """Context manager for database connections"""
         try:
             self.conn = self._connect_with_fallback()
-            self.cursor = self.conn.cursor(buffered=True)
+            self.cursor = self._new_cursor()
             yield self.conn, self.cursor
         finally:
             if self.cursor:
                 self.cursor.close()
             if self.conn:
+                # Returns it to the pool; a pooled connection can't be closed twice
                 self.conn.close()
+            self.cursor = None
+            self.conn = None
+    
+    def _new_cursor(self):
+        """Unbuffered raw cursor: result rows are streamed and discarded as
+        they arrive instead of being collected and converted to Python values"""
+        return self.conn.cursor(buffered=False, raw=True)
+    
+    def _get_pooled_connection(self):
+        """Borrow a connection, creating the pool for the current user on first use"""
+        if self._pool is None:
+            self._pool = MySQLConnectionPool(
+                pool_name=f"bench_{self.database_type}_{self.db_config['user']}",
+                pool_size=POOL_SIZE,
+                # Nothing carries over between queries, and not every
+                # server's MySQL interface supports resetting a session
+                pool_reset_session=False,
+                use_pure=False,
+                **self.db_config
+            )
+        return self._pool.get_connection()
     
     def _connect_with_fallback(self) -> mysql.connector.MySQLConnection:
         """Attempt connection with fallback to 'default' user if needed"""
         try:
-            conn = mysql.connector.connect(**self.db_config)
+            conn = self._get_pooled_connection()
             logger.info(f"Connected successfully with user: {self.db_config['user']}")
             return conn
         except mysql.connector.Error as err:
             if self._is_auth_error(err) and self.db_config['user'] != 'default':
                 logger.info(f"Authentication failed with '{self.db_config['user']}', trying 'default'...")
                 self.db_config["user"] = "default"
+                self._pool = None
                 try:
-                    conn = mysql.connector.connect(**self.db_config)
+                    conn = self._get_pooled_connection()
                     logger.info(f"Connected successfully with user: {self.db_config['user']}")
                     return conn
                 except mysql.connector.Error as fallback_err:
@@ -127,48 +212,67 @@ class DatabaseBenchmark:
     @staticmethod
     def _is_auth_error(err: mysql.connector.Error) -> bool:
         """Check if error is authentication related"""
-        error_str = str(err).lower()
-        auth_patterns = ["access denied", "authentication", "unknown user", "user", "password", "denied"]
-        return any(pattern in error_str for pattern in auth_patterns)
+        return AUTH_ERROR_PATTERN.search(str(err)) is not None
     
     @staticmethod
     def _is_memory_error(err: mysql.connector.Error) -> bool:
         """Check if error is memory related"""
-        error_str = str(err).lower()
-        return "mem_limit_exceeded" in error_str or "memory not enough" in error_str
+        return MEMORY_ERROR_PATTERN.search(str(err)) is not None
     
     @staticmethod
     def _is_timeout_error(err: mysql.connector.Error) -> bool:
         """Check if error is timeout related"""
-        error_str = str(err).lower()
-        return "timeout" in error_str or "cancelled" in error_str
+        return TIMEOUT_ERROR_PATTERN.search(str(err)) is not None
     
-    def _execute_statements(self, cursor, sql_script: str) -> None:
-        """Execute SQL statements from script"""
-        statements = [stmt.strip() for stmt in sql_script.split(";") if stmt.strip()]
-        
+    def _execute_statements(self, cursor, statements: List[bytes]) -> None:
+        """Execute SQL statements from script, committing once at the end"""
         for statement in statements:
             cursor.execute(statement)
             
             if cursor.with_rows:
-                cursor.fetchall()
+                while cursor.fetchmany(FETCH_BATCH_SIZE):
+                    pass
             
             while cursor.nextset():
                 pass
-            
+        
+        # The benchmark scripts are read-only, so a commit after every
+        # statement only added a round trip to each timed query
+        if self.conn.in_transaction:
             self.conn.commit()
     
+    def _discard_connection(self) -> None:
+        """Hand the current connection back to the pool, which lends it out
+        again (reconnecting it first if the server dropped it)"""
+        for resource in (self.cursor, self.conn):
+            if resource:
+                try:
+                    resource.close()
+                except mysql.connector.Error:
+                    pass
+        self.cursor = None
+        self.conn = None
+    
     def execute_query_with_retry(self, sql_script: str, filename: str) -> Tuple[bool, float]:
         """Execute query with retry logic"""
+        # Split once; retries reuse the same statements
+        statements = split_sql_statements(sql_script)
+        if self.measure == 'backend-only':
+            statements = [count_only(statement) for statement in statements]
+        # Encoded once here; the driver sends bytes as-is on every attempt
+        statements = [statement.encode("utf-8") for statement in statements]
+        
         for attempt in range(MAX_RETRIES):
             try:
                 start_time = time.time()
                 
-                if not self.conn or not self.conn.is_connected():
+                # No ping before each query: a dropped connection surfaces
+                # as a connection-lost error below and is replaced then
+                if not self.conn:
                     self.conn = self._connect_with_fallback()
-                    self.cursor = self.conn.cursor(buffered=True)
+                    self.cursor = self._new_cursor()
                 
-                self._execute_statements(self.cursor, sql_script)
+                self._execute_statements(self.cursor, statements)
                 
                 elapsed_time = time.time() - start_time
                 minutes, seconds = divmod(elapsed_time, 60)
@@ -176,6 +280,11 @@ class DatabaseBenchmark:
                 return True, elapsed_time
                 
             except mysql.connector.Error as err:
+                if err.errno in CONNECTION_LOST_ERRNOS and attempt < MAX_RETRIES - 1:
+                    logger.warning(f"⚠️  Lost connection while running {filename}; reconnecting...")
+                    self._discard_connection()
+                    continue
+                
                 if self._is_memory_error(err) or self._is_timeout_error(err):
                     if attempt < MAX_RETRIES - 1:
                         error_type = "Memory" if self._is_memory_error(err) else "Timeout"
@@ -184,10 +293,7 @@ class DatabaseBenchmark:
                         
                         # Reconnect for memory errors
                         if self._is_memory_error(err):
-                            if self.cursor:
-                                self.cursor.close()
-                            if self.conn:
-                                self.conn.close()
+                            self._discard_connection()
                             time.sleep(2)
                         continue
                     else:
@@ -205,13 +311,22 @@ class DatabaseBenchmark:
         
         return False, 0
     
+    def _read_script(self, file_path: str) -> str:
+        """Read a SQL file, keeping its text for a restart with another user"""
+        if file_path not in self._scripts:
+            with open(file_path, "r", encoding="utf-8") as file:
+                self._scripts[file_path] = file.read()
+        return self._scripts[file_path]
+    
     def get_sql_files(self, queries_folder: str) -> List[str]:
         """Get sorted list of SQL files"""
         if not os.path.exists(queries_folder):
             logger.error(f"Queries folder not found: {queries_folder}")
             sys.exit(1)
         
-        sql_files = [f for f in os.listdir(queries_folder) if f.endswith(".sql")]
+        # One directory read; DirEntry answers is_file() from it on most platforms
+        with os.scandir(queries_folder) as entries:
+            sql_files = [entry.name for entry in entries if entry.name.endswith(".sql") and entry.is_file()]
         
         if not sql_files:
             logger.error(f"No SQL files found in {queries_folder}")
@@ -224,11 +339,15 @@ class DatabaseBenchmark:
             # Fallback to alphabetical sort if numeric prefix fails
             return sorted(sql_files)
     
-    def run_benchmarks(self, queries_folder: str = "queries/sql") -> None:
+    def run_benchmarks(self, queries_folder: str = "queries/sql", concurrency: int = 1) -> None:
         """Run all benchmarks"""
         sql_files = self.get_sql_files(queries_folder)
         logger.info(f"🚀 Running {len(sql_files)} queries on {self.database_type.upper()}")
         
+        if concurrency > 1:
+            self._run_concurrently(sql_files, queries_folder, concurrency)
+            return
+        
         successful_queries = []
         failed_queries = []
         total_time = 0
@@ -239,8 +358,7 @@ class DatabaseBenchmark:
                 file_path = os.path.join(queries_folder, sql_file)
                 
                 try:
-                    with open(file_path, "r", encoding="utf-8") as file:
-                        sql_script = file.read()
+                    sql_script = self._read_script(file_path)
                     
                     if not sql_script.strip():
                         logger.warning(f"⚠️  Empty SQL file: {sql_file}")
@@ -274,9 +392,67 @@ class DatabaseBenchmark:
         if failed_queries:
             sys.exit(1)
     
+    def _run_concurrently(self, sql_files: List[str], queries_folder: str, concurrency: int) -> None:
+        """Run the SQL files on `concurrency` connections at once.
+        
+        Each worker is a DatabaseBenchmark with its own connection, handed
+        to one query at a time. Per-query times then include any contention
+        between queries, so they are not comparable with a serial run.
+        """
+        workers = [DatabaseBenchmark(self.database_type, dict(self.db_config), self.measure)
+                   for _ in range(concurrency)]
+        idle = queue.Queue()
+        
+        def run_one(sql_file: str) -> Optional[Tuple[str, bool, float]]:
+            worker = idle.get()
+            try:
+                logger.info(f"\n🔄 Processing {sql_file}...")
+                sql_script = self._read_script(os.path.join(queries_folder, sql_file))
+                if not sql_script.strip():
+                    logger.warning(f"⚠️  Empty SQL file: {sql_file}")
+                    return None
+                success, query_time = worker.execute_query_with_retry(sql_script, sql_file)
+                return sql_file, success, query_time
+            except (OSError, UnicodeDecodeError, mysql.connector.Error) as err:
+                logger.error(f"❌ Error with {sql_file}: {err}")
+                return sql_file, False, 0
+            finally:
+                idle.put(worker)
+        
+        successful_queries = []
+        failed_queries = []
+        total_time = 0
+        
+        logger.info(f"🔀 Using {concurrency} concurrent connections")
+        start_time = time.time()
+        with ExitStack() as stack:
+            for worker in workers:
+                stack.enter_context(worker.connection())
+                idle.put(worker)
+            
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                # map() keeps the results in file order for the summary
+                for result in executor.map(run_one, sql_files):
+                    if result is None:
+                        continue
+                    sql_file, success, query_time = result
+                    if success:
+                        successful_queries.append((sql_file, query_time))
+                        total_time += query_time
+                    else:
+                        failed_queries.append(sql_file)
+        
+        self._print_summary(successful_queries, failed_queries, total_time)
+        minutes, seconds = divmod(time.time() - start_time, 60)
+        logger.info(f"⏱️  Wall-clock time: {int(minutes)}m {seconds:.2f}s")
+        
+        if failed_queries:
+            sys.exit(1)
+    
     def _restart_with_default_user(self, sql_files: List[str], queries_folder: str) -> None:
         """Restart benchmark with default user"""
         self.db_config["user"] = "default"
+        self._pool = None
         
         successful_queries = []
         failed_queries = []
@@ -288,8 +464,7 @@ class DatabaseBenchmark:
                 file_path = os.path.join(queries_folder, sql_file)
                 
                 try:
-                    with open(file_path, "r", encoding="utf-8") as file:
-                        sql_script = file.read()
+                    sql_script = self._read_script(file_path)
                     
                     success, query_time = self.execute_query_with_retry(sql_script, sql_file)
                     
@@ -343,6 +518,11 @@ def main():
     parser.add_argument('--user', help='Database user (overrides default for selected database)')
     parser.add_argument('--password', help='Database password (overrides default for selected database)')
     parser.add_argument('--queries-folder', default='queries/sql', help='Path to SQL queries folder')
+    parser.add_argument('--measure', choices=['end-to-end', 'backend-only'], default='end-to-end',
+                       help='end-to-end times fetching every row; backend-only wraps each query in '
+                            'SELECT COUNT(*) so only one row comes back')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Number of queries to run at once, each on its own connection (default: 1, serial)')
     
     args = parser.parse_args()
     
@@ -362,8 +542,8 @@ def main():
         logger.info(f"🔧 Override password: ***")
     
     # Run benchmarks
-    benchmark = DatabaseBenchmark(args.database, config_overrides)
-    benchmark.run_benchmarks(args.queries_folder)
+    benchmark = DatabaseBenchmark(args.database, config_overrides, args.measure)
+    benchmark.run_benchmarks(args.queries_folder, args.concurrency)
 
 if __name__ == "__main__":
     main()